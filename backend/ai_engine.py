@@ -1,20 +1,33 @@
+import asyncio
 import json
 import os
-from typing import List, Optional
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 from openai import AsyncOpenAI
 from agents import (
     Agent,
+    ModelSettings,
+    OpenAIProvider,
+    RunConfig,
     Runner,
-    set_default_openai_client,
     set_tracing_disabled,
-    set_default_openai_api,
 )
-from agents.exceptions import InputGuardrailTripwireTriggered
+from agents.strict_schema import ensure_strict_json_schema
+from agents.usage import Usage
+from openai.types.responses import ResponseTextDeltaEvent
 from pydantic import BaseModel
 
+from cache import cache_key, make_cache
+from integrity import IntegrityCheckOutput, check_integrity
+from llm_clients import CLIENT_REGISTRY, get_rate_limiter
+from metrics import INTEGRITY_CHECKS, record_llm_retry, record_llm_run
 from schemas.cv import CVData, ContactInfo
-from templates import get_template
+from skills import build_gap_digest
+from streaming import JSONFieldStream
+from templates import TEMPLATES, CVTemplate, get_template
+from validation import structure_violations
 
 # ============================================================
 # Disable tracing if no ENV api key
@@ -51,8 +64,28 @@ PROVIDER_CONFIG = {
     },
 }
 
-# Ensure agents library uses standard chat completions (Gemini/Ollama compat)
-set_default_openai_api("chat_completions")
+# ============================================================
+# GAP DIGEST
+# ============================================================
+# When enabled, the Gap Analyzer receives a locally computed digest (missing skills,
+# missing contact fields, relevant excerpts) instead of the full CV and job description.
+GAP_DIGEST_ENABLED = os.getenv("GAP_DIGEST", "true").lower() != "false"
+
+
+def _gap_input(cv_text: str, job_description: str) -> str:
+    full_text = (
+        f"CV:\n{cv_text}\n\n"
+        f"Job Description:\n{job_description}"
+    )
+    if not GAP_DIGEST_ENABLED:
+        return full_text
+    digest = build_gap_digest(cv_text, job_description)
+    if not digest.required_skills:
+        # No known skills in the job description: a digest would drop the substance.
+        return full_text
+    digest_text = f"Gap digest:\n{digest.render()}"
+    return digest_text if len(digest_text) < len(full_text) else full_text
+
 
 # ============================================================
 # INTERNAL MODELS (used only inside ai_engine)
@@ -73,51 +106,48 @@ class GapAnalysisResponse(BaseModel):
     gaps: List[GapAnalysisItem]
 
 
-class StructureCheckOutput(BaseModel):
-    valid: bool
-    missing_sections: List[str]
-    reasoning: str
-
-
-class IntegrityCheckOutput(BaseModel):
-    valid: bool
-    invented_terms: List[str]
-    reasoning: str
-
-
 # ============================================================
 # CLIENT FACTORY
 # ============================================================
 def get_client(api_key: Optional[str] = None, provider: str = "openai") -> AsyncOpenAI:
-    env = os.getenv("ENV", "development")
-    print(f"[DEBUG] ENV: {env}, provider: {provider}, api_key provided: {bool(api_key)}")
-
+    """Return a pooled client for (provider, base_url, api_key), reusing warm connections."""
     config = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])
 
     if api_key:
-        return AsyncOpenAI(api_key=api_key, base_url=config["base_url"])
+        return CLIENT_REGISTRY.get(provider, config["base_url"], api_key)
 
-    if env == "production":
+    if os.getenv("ENV", "development") == "production":
         raise RuntimeError("API Key is required in production (via Header).")
 
     # Fallback dev: Ollama
     ollama_config = PROVIDER_CONFIG["ollama"]
-    return AsyncOpenAI(
-        api_key="ollama",
-        base_url=ollama_config["base_url"],
+    return CLIENT_REGISTRY.get("ollama", ollama_config["base_url"], "ollama")
+
+
+def get_run_config(client: AsyncOpenAI) -> RunConfig:
+    """
+    Bind a run to one request's client instead of the process-global default,
+    so concurrent requests for different tenants/providers never share a client.
+    Chat completions are used for Gemini/Ollama compatibility.
+    """
+    return RunConfig(
+        model_provider=OpenAIProvider(openai_client=client, use_responses=False),
     )
 
 
 # ============================================================
 # AGENT FACTORY
 # ============================================================
-def build_agents(language_code: str = "en", model: str = "gpt-4o", template=None):
-    language_name = SUPPORTED_LANGUAGES.get(language_code, "English")
+# Providers cache the longest byte-identical prompt prefix (OpenAI cached input
+# tokens, Gemini implicit caching). Instructions are therefore assembled from
+# blocks ordered from most to least shared: role rules (identical for every
+# request), then template rules, then language rules. Request content always
+# comes after the instructions, in the user message.
+def _layered_instructions(*blocks: str) -> str:
+    return "\n\n".join(block.strip() for block in blocks if block.strip()) + "\n"
 
-    gap_agent = Agent(
-        name="Gap Analyzer",
-        model=model,
-        instructions=f"""
+
+_GAP_RULES = """
 You are a CV gap analyzer. Compare the CV and job description.
 Generate 4–7 clarification questions to fill gaps between the candidate profile and the job requirements.
 
@@ -130,44 +160,37 @@ Each question must target:
 Also check if the CV is missing any contact information (email, phone, location, LinkedIn, portfolio).
 If any contact fields are missing, include a question asking the candidate to provide them.
 
-LANGUAGE RULE: Write ALL questions and reasoning in {language_name}. No exceptions.
-""",
+The input is either the full CV and job description, or a pre-computed gap digest:
+lists of job skills missing from / present in the CV, missing contact fields, and the relevant
+CV and job description excerpts. When given a digest, trust its lists and prioritize the missing skills.
+"""
+
+
+def _build_gap_agent(language_name: str, model: str, template: CVTemplate) -> Agent:
+    return Agent(
+        name="Gap Analyzer",
+        model=model,
+        instructions=_layered_instructions(
+            _GAP_RULES,
+            f"LANGUAGE RULE: Write ALL questions and reasoning in {language_name}. No exceptions.",
+        ),
         output_type=GapAnalysisResponse,
     )
 
-    # Build CV agent instructions with template rules + few-shot example
-    if template is None:
-        from templates import get_template as _get_template
-        template = _get_template("classic", language_code)
-
-    example_json = json.dumps(template.example, indent=2, ensure_ascii=False)
 
-    cv_agent = Agent(
-        name="CV Strategist",
-        model=model,
-        instructions=f"""
+_CV_RULES = """
 You are an expert CV writer. Rewrite the CV using the original CV, the job description, and the candidate's clarification answers.
 Return the result as a structured JSON object matching the CVData schema exactly.
 
-LANGUAGE RULE: Write ALL content — including every section heading, summary, and bullets — entirely in {language_name}. No exceptions. Do not mix languages.
-
-FORMATTING RULES:
-- Dates: {template.date_format}
-- Current job end date: "{template.present_word}"
-- Bullets: {template.bullet_format}
-- Skills: Group skills logically into 3-5 categories (e.g. "Frontend", "Backend", "Tools", "Cloud"). 
-  For each group, list relevant technologies as items. 
-  Ensure categories and items are entirely in {language_name}.
-- job_title field: {template.job_title_format}
-- company field: {template.company_format}
+GENERAL FORMATTING RULES:
+- Skills: Group skills logically into 3-5 categories (e.g. "Frontend", "Backend", "Tools", "Cloud").
+  For each group, list relevant technologies as items.
 - match_score: An integer between 0 and 100 representing how well the candidate aligns with the job after optimization.
 
 AI WRITING STYLE:
 - Avoid "I", "my", or first-person pronouns.
 - Be punchy, professional, and result-oriented.
 - Focus on how the candidate's skills specifically solve the problems mentioned in the Job Description.
-EXAMPLE of a correctly formatted ExperienceEntry:
-{example_json}
 
 STRICT RULES:
 1. Extract the candidate's full name, title, email, phone, location, LinkedIn, and portfolio into the `contact` field.
@@ -180,35 +203,39 @@ STRICT RULES:
 3. `skills`: flat list of keyword strings only. No sentences. No bullets.
 4. `experience`: list of ExperienceEntry objects. Never write bullets as prose paragraphs.
 5. `education`: degree, institution, start_date, end_date only. No impact statements.
-6. `optimization_report`: 3–5 sentence summary in {language_name} of what was changed and why.
+6. `optimization_report`: 3–5 sentence summary, in the output language, of what was changed and why.
 7. Preserve ALL factual data — never invent technologies, metrics, companies, or roles.
 8. Naturally reinforce terminology from the job description where it truthfully applies.
-""",
-        output_type=CVData,
-    )
+"""
+
+
+def _build_cv_agent(language_name: str, model: str, template: CVTemplate) -> Agent:
+    # Few-shot example from the template rules
+    example_json = json.dumps(template.example, indent=2, ensure_ascii=False)
+
+    template_rules = f"""
+TEMPLATE FORMATTING RULES:
+- Dates: {template.date_format}
+- Bullets: {template.bullet_format}
+- job_title field: {template.job_title_format}
+- company field: {template.company_format}
 
-    structure_guard = Agent(
-        name="Structure Validator",
+EXAMPLE of a correctly formatted ExperienceEntry:
+{example_json}
+"""
+    language_rules = f"""
+LANGUAGE RULE: Write ALL content — including every section heading, summary, skill categories and items, bullets and the optimization_report — entirely in {language_name}. No exceptions. Do not mix languages.
+- Current job end date: "{template.present_word}"
+"""
+    return Agent(
+        name="CV Strategist",
         model=model,
-        instructions=f"""
-Validate that the CVData object contains all required fields:
-- contact.name is non-empty
-- summary is non-empty
-- skills is a non-empty list
-- experience is a non-empty list, each entry has job_title, company, start_date, end_date, and at least one bullet
-- education is a non-empty list, each entry has degree and institution
-- optimization_report is non-empty
-
-Language: {language_name}
-Return valid=True only if all criteria are met.
-""",
-        output_type=StructureCheckOutput,
+        instructions=_layered_instructions(_CV_RULES, template_rules, language_rules),
+        output_type=CVData,
     )
 
-    integrity_guard = Agent(
-        name="Integrity Validator",
-        model=model,
-        instructions="""
+
+_INTEGRITY_RULES = """
 Compare the original CV and the generated CVData.
 Verify that:
 - No technologies or tools were invented
@@ -216,22 +243,241 @@ Verify that:
 - No experience entries or companies were removed
 - No job titles or roles were changed
 
+Facts stated in the candidate clarifications count as part of the original.
+Translations and rephrasings of original facts are not violations.
+When terms to verify are listed, check those first.
+
 Return valid=True only if the generated CV faithfully and accurately represents the original.
-""",
+"""
+
+
+def _build_integrity_guard(language_name: str, model: str, template: CVTemplate) -> Agent:
+    return Agent(
+        name="Integrity Validator",
+        model=model,
+        instructions=_layered_instructions(_INTEGRITY_RULES),
         output_type=IntegrityCheckOutput,
     )
 
-    corrector = Agent(
+
+_CORRECTOR_RULES = """
+Fix only the listed violations. Preserve all factual information from the original CV.
+Return a corrected CVData object.
+"""
+
+
+def _build_corrector(language_name: str, model: str, template: CVTemplate) -> Agent:
+    return Agent(
         name="Corrector",
         model=model,
-        instructions=f"""
-Fix only the listed violations. Preserve all factual information from the original CV.
-Maintain the same language ({language_name}) and return a corrected CVData object.
-""",
+        instructions=_layered_instructions(
+            _CORRECTOR_RULES,
+            f"Maintain the same language ({language_name}).",
+        ),
         output_type=CVData,
     )
 
-    return gap_agent, cv_agent, structure_guard, integrity_guard, corrector
+
+_QUICK_RULES = """
+You are a hiring manager. Analyze if the CV matches the job description.
+Provide a match score (0-100), a short summary report, and two lists: key strengths and missing requirements.
+"""
+
+
+def _build_quick_analyst(language_name: str, model: str, template: CVTemplate) -> Agent:
+    return Agent(
+        name="Quick Analyst",
+        model=model,
+        instructions=_layered_instructions(_QUICK_RULES, f"Output MUST be in {language_name}."),
+        output_type=QuickAnalysisResponse,
+    )
+
+
+AGENT_BUILDERS = {
+    "gap": _build_gap_agent,
+    "cv": _build_cv_agent,
+    "integrity": _build_integrity_guard,
+    "corrector": _build_corrector,
+    "quick": _build_quick_analyst,
+}
+
+
+@lru_cache(maxsize=None)
+def _cached_agent(language_code: str, model: str, template_id: str, role: str) -> Agent:
+    template = get_template(template_id, language_code)
+    language_name = SUPPORTED_LANGUAGES[language_code]
+    agent = AGENT_BUILDERS[role](language_name, model, template)
+    # The agents SDK only asks api.openai.com for usage on streamed runs; ask every provider.
+    settings = ModelSettings(include_usage=True)
+    if model == PROVIDER_CONFIG["openai"]["default_model"]:
+        # Route requests that share these instructions to the same OpenAI prompt cache.
+        # Without it the agents SDK sends a fresh key per run, which scatters cache hits.
+        # OpenAI-only parameter, so other providers' models are left untouched.
+        settings = settings.resolve(ModelSettings(
+            extra_args={"prompt_cache_key": f"smartcv:{role}:{template_id}:{language_code}"}
+        ))
+    return agent.clone(model_settings=settings)
+
+
+def get_agent(role: str, language_code: str = "en", model: str = "gpt-4o", template_id: str = "classic") -> Agent:
+    """
+    Return the agent for `role`, built once per (language, model, template_id, role).
+    Unknown languages/templates fall back to English/classic so the cache stays bounded.
+    """
+    if role not in AGENT_BUILDERS:
+        raise KeyError(f"Unknown agent role '{role}'. Valid options: {list(AGENT_BUILDERS.keys())}")
+    if language_code not in SUPPORTED_LANGUAGES:
+        language_code = "en"
+    if template_id not in TEMPLATES:
+        template_id = "classic"
+    return _cached_agent(language_code, model, template_id, role)
+
+
+def warm_agent_cache() -> None:
+    """Build every agent up front so the first request doesn't pay for prompt assembly."""
+    models = {config["default_model"] for config in PROVIDER_CONFIG.values()}
+    for language_code in SUPPORTED_LANGUAGES:
+        for model in models:
+            for template_id in TEMPLATES:
+                for role in AGENT_BUILDERS:
+                    get_agent(role, language_code, model, template_id)
+
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+# Content-addressed: identical (endpoint, prompt, model, language, template)
+# inputs reuse the previous structured output instead of a new LLM round trip.
+RESPONSE_CACHE = make_cache("LLM_CACHE", ttl_seconds=24 * 3600)
+
+
+def _response_key(endpoint: str, agent: Agent, input_text: str, language: str, template_id: str = "") -> str:
+    return cache_key(endpoint, agent.instructions, input_text, agent.model, language, template_id)
+
+
+async def _cached_output(key: str, output_type: type, use_cache: bool):
+    if not use_cache:
+        return None
+    raw = await RESPONSE_CACHE.aget(key)
+    return output_type.model_validate_json(raw) if raw is not None else None
+
+
+async def _store_output(key: str, output: BaseModel) -> None:
+    await RESPONSE_CACHE.aset(key, output.model_dump_json().encode("utf-8"))
+
+
+# ============================================================
+# PROMPT CACHE USAGE
+# ============================================================
+class PromptCacheStats:
+    """Per-agent input and provider-cached input token counters, read from each run's usage."""
+
+    def __init__(self):
+        self._agents: Dict[str, Dict[str, int]] = {}
+
+    def record(self, agent_name: str, usage: Usage) -> None:
+        counters = self._agents.setdefault(agent_name, {"requests": 0, "input_tokens": 0, "cached_tokens": 0})
+        counters["requests"] += usage.requests
+        counters["input_tokens"] += usage.input_tokens
+        counters["cached_tokens"] += usage.input_tokens_details.cached_tokens or 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        def with_ratio(counters: Dict[str, int]) -> Dict[str, Any]:
+            ratio = counters["cached_tokens"] / counters["input_tokens"] if counters["input_tokens"] else 0.0
+            return {**counters, "cached_ratio": round(ratio, 4)}
+
+        total = {"requests": 0, "input_tokens": 0, "cached_tokens": 0}
+        for counters in self._agents.values():
+            for name in total:
+                total[name] += counters[name]
+        return {
+            "total": with_ratio(total),
+            "agents": {name: with_ratio(counters) for name, counters in self._agents.items()},
+        }
+
+
+PROMPT_CACHE_STATS = PromptCacheStats()
+
+
+# ============================================================
+# RUN INSTRUMENTATION
+# ============================================================
+def _run_labels(provider: str, endpoint: str, language: str) -> Dict[str, str]:
+    # Unknown values are folded into their fallbacks so metric label sets stay bounded.
+    return {
+        "provider": provider if provider in PROVIDER_CONFIG else "openai",
+        "endpoint": endpoint,
+        "language": language if language in SUPPORTED_LANGUAGES else "en",
+    }
+
+
+def _record_run(agent: Agent, labels: Dict[str, str], started: float, usage: Optional[Usage] = None,
+                failed: bool = False) -> None:
+    if usage is not None:
+        PROMPT_CACHE_STATS.record(agent.name, usage)
+    record_llm_run(model=agent.model, agent=agent.name, seconds=time.perf_counter() - started,
+                   usage=usage, failed=failed, **labels)
+
+
+async def _run_agent(agent: Agent, input_text: str, run_config: RunConfig, labels: Dict[str, str]):
+    started = time.perf_counter()
+    try:
+        result = await Runner.run(agent, input_text, run_config=run_config)
+    except Exception:
+        _record_run(agent, labels, started, failed=True)
+        raise
+    _record_run(agent, labels, started, result.context_wrapper.usage)
+    return result
+
+
+# ============================================================
+# STRUCTURED OUTPUT FAST PATH
+# ============================================================
+# Single-turn, tool-free agents (quick analysis, gap analysis) are sent straight to
+# chat completions with the same instructions, JSON schema and model settings the
+# Runner would use, skipping its orchestration. Multi-step flows keep using Runner.
+@lru_cache(maxsize=None)
+def _response_format(output_type: type) -> Dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "final_output",
+            "strict": True,
+            "schema": ensure_strict_json_schema(output_type.model_json_schema()),
+        },
+    }
+
+
+async def _complete_structured(agent: Agent, input_text: str, client: AsyncOpenAI, labels: Dict[str, str]):
+    """Run a single-turn `agent` as one chat completion and parse its `output_type`."""
+    started = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(
+            model=agent.model,
+            messages=[
+                {"role": "system", "content": agent.instructions},
+                {"role": "user", "content": input_text},
+            ],
+            response_format=_response_format(agent.output_type),
+            **(agent.model_settings.extra_args or {}),
+        )
+        message = response.choices[0].message
+        if not message.content:
+            raise ValueError(f"{agent.name} returned no output: {message.refusal or 'empty response'}")
+        output = agent.output_type.model_validate_json(message.content)
+    except Exception:
+        _record_run(agent, labels, started, failed=True)
+        raise
+    usage = Usage(
+        requests=1,
+        input_tokens=response.usage.prompt_tokens,
+        output_tokens=response.usage.completion_tokens,
+        total_tokens=response.usage.total_tokens,
+        input_tokens_details=response.usage.prompt_tokens_details,
+        output_tokens_details=response.usage.completion_tokens_details,
+    ) if response.usage is not None else Usage(requests=1)
+    _record_run(agent, labels, started, usage)
+    return output
 
 
 # ============================================================
@@ -243,20 +489,23 @@ async def analyze_gaps(
     api_key: Optional[str] = None,
     language: str = "en",
     provider: str = "openai",
+    use_cache: bool = True,
 ) -> List[GapAnalysisItem]:
     client = get_client(api_key, provider)
-    set_default_openai_client(client)
 
     model = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])["default_model"]
-    gap_agent, _, _, _, _ = build_agents(language, model)
+    gap_agent = get_agent("gap", language, model)
 
-    input_text = (
-        f"CV:\n{cv_text}\n\n"
-        f"Job Description:\n{job_description}"
-    )
+    input_text = _gap_input(cv_text, job_description)
 
-    result = await Runner.run(gap_agent, input_text)
-    return result.final_output.gaps
+    key = _response_key("analyze-gaps", gap_agent, input_text, language)
+    cached = await _cached_output(key, GapAnalysisResponse, use_cache)
+    if cached is not None:
+        return cached.gaps
+
+    output = await _complete_structured(gap_agent, input_text, client, _run_labels(provider, "analyze-gaps", language))
+    await _store_output(key, output)
+    return output.gaps
 
 
 async def generate_cv(
@@ -268,51 +517,310 @@ async def generate_cv(
     provider: str = "openai",
     template_id: str = "classic",
     max_retries: int = 2,
+    use_cache: bool = True,
 ) -> CVData:
-    client = get_client(api_key, provider)
-    set_default_openai_client(client)
+    events = _generate_cv_events(
+        cv_text, job_description, user_answers, api_key, language, provider, template_id, max_retries,
+        use_cache, "generate-cv",
+    )
+    async for field, _, value in events:
+        if field == "done":
+            return CVData.model_validate(value)
+
+
+# ============================================================
+# STREAMING
+# ============================================================
+# Stream events are (field, index, value) tuples as produced by JSONFieldStream,
+# followed by a final ("done", None, full_output_dict).
+StreamEvent = Tuple[str, Optional[int], Any]
+
+CV_STREAM_ARRAYS = ("skills", "experience", "education")
+GAP_STREAM_ARRAYS = ("gaps",)
+
+
+def _replay_sections(output: BaseModel, expand: Iterable[str]) -> List[StreamEvent]:
+    """Split a finished output into the same section events a live stream would produce."""
+    events = []
+    for field, value in output.model_dump(mode="json").items():
+        if field in expand:
+            events.extend((field, index, item) for index, item in enumerate(value))
+        else:
+            events.append((field, None, value))
+    return events
+
+
+async def _stream_run(
+    agent: Agent,
+    input_text: str,
+    run_config: RunConfig,
+    labels: Dict[str, str],
+    scanner: JSONFieldStream,
+) -> AsyncIterator[StreamEvent]:
+    """Run `agent` streamed: yield sections as `scanner` completes them, then ("done", None, final_output)."""
+    started = time.perf_counter()
+    result = Runner.run_streamed(agent, input_text, run_config=run_config)
+    try:
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                for section in scanner.feed(event.data.delta):
+                    yield section
+    except Exception:
+        _record_run(agent, labels, started, failed=True)
+        raise
+
+    _record_run(agent, labels, started, result.context_wrapper.usage)
+    yield ("done", None, result.final_output)
+
+
+def _stream_agent(
+    agent: Agent,
+    input_text: str,
+    run_config: RunConfig,
+    labels: Dict[str, str],
+    key: str,
+    output_type: type,
+    expand: Iterable[str],
+    use_cache: bool,
+) -> AsyncIterator[StreamEvent]:
+    async def events() -> AsyncIterator[StreamEvent]:
+        cached = await _cached_output(key, output_type, use_cache)
+        if cached is not None:
+            for event in _replay_sections(cached, expand):
+                yield event
+            yield ("done", None, cached.model_dump(mode="json"))
+            return
+
+        async for field, index, value in _stream_run(agent, input_text, run_config, labels, JSONFieldStream(expand)):
+            if field == "done":
+                await _store_output(key, value)
+                value = value.model_dump(mode="json")
+            yield (field, index, value)
+
+    return events()
+
+
+def stream_generate_cv(
+    cv_text: str,
+    job_description: str,
+    user_answers: List[dict],
+    api_key: Optional[str] = None,
+    language: str = "en",
+    provider: str = "openai",
+    template_id: str = "classic",
+    max_retries: int = 2,
+    use_cache: bool = True,
+) -> AsyncIterator[StreamEvent]:
+    """
+    Streamed variant of `generate_cv`. Yields each CVData section as soon as the
+    model has finished writing it: contact, summary, then every skills/experience/
+    education entry individually. The final "done" event carries the validated CV,
+    which replaces the streamed sections if a correction was needed. Client setup
+    errors are raised before the iterator is returned, so callers can still answer
+    with a plain HTTP error.
+    """
+    return _generate_cv_events(
+        cv_text, job_description, user_answers, api_key, language, provider, template_id, max_retries,
+        use_cache, "generate-cv/stream",
+    )
+
+
+def stream_analyze_gaps(
+    cv_text: str,
+    job_description: str,
+    api_key: Optional[str] = None,
+    language: str = "en",
+    provider: str = "openai",
+    use_cache: bool = True,
+) -> AsyncIterator[StreamEvent]:
+    """Streamed variant of `analyze_gaps`: yields one ("gaps", index, GapAnalysisItem dict) per question."""
+    run_config = get_run_config(get_client(api_key, provider))
 
     model = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])["default_model"]
-    template = get_template(template_id, language)
-    _, cv_agent, _, _, corrector = build_agents(language, model, template)
+    gap_agent = get_agent("gap", language, model)
+
+    input_text = _gap_input(cv_text, job_description)
+
+    key = _response_key("analyze-gaps", gap_agent, input_text, language)
+    labels = _run_labels(provider, "analyze-gaps/stream", language)
+    return _stream_agent(gap_agent, input_text, run_config, labels, key, GapAnalysisResponse, GAP_STREAM_ARRAYS, use_cache)
+
 
-    answers_text = "\n".join(
+def stream_quick_analyze_cv(
+    cv_text: str,
+    job_description: str,
+    api_key: str,
+    language: str = "pt-br",
+    provider: str = "openai",
+    use_cache: bool = True,
+) -> AsyncIterator[StreamEvent]:
+    """Streamed variant of `quick_analyze_cv`: yields each QuickAnalysisResponse field as it completes."""
+    run_config = get_run_config(get_client(api_key, provider))
+
+    model = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])["default_model"]
+    agent = get_agent("quick", language, model)
+
+    input_text = f"CV Context:\n{cv_text}\n\nJob Description:\n{job_description}"
+    key = _response_key("quick-analyze", agent, input_text, language)
+    labels = _run_labels(provider, "quick-analyze/stream", language)
+    return _stream_agent(agent, input_text, run_config, labels, key, QuickAnalysisResponse, (), use_cache)
+
+
+# ============================================================
+# CV GENERATION PIPELINE
+# ============================================================
+# Structure is checked locally (validation.py). Integrity is checked locally first
+# (integrity.py); the Integrity Validator is asked only about terms the local check
+# cannot settle. The check starts speculatively as soon as the fact-bearing sections
+# have streamed, so it runs while the model is still writing the optimization report
+# and score. The Corrector only runs when a check reports a violation.
+CV_FACT_FIELDS = ("contact", "summary", "skills", "experience", "education")
+
+
+def _answers_text(user_answers: List[dict]) -> str:
+    return "\n".join(
         [f"Q: {a['question']}\nA: {a['answer']}" for a in user_answers]
     )
 
-    input_text = (
+
+def _cv_input(cv_text: str, job_description: str, user_answers: List[dict]) -> str:
+    return (
         f"Original CV:\n{cv_text}\n\n"
         f"Job Description:\n{job_description}\n\n"
-        f"Candidate Clarifications:\n{answers_text}"
+        f"Candidate Clarifications:\n{_answers_text(user_answers)}"
     )
 
-    last_output: Optional[CVData] = None
-    attempt = 0
-    while attempt <= max_retries:
-        try:
-            result = await Runner.run(cv_agent, input_text)
-            return result.final_output  # type: CVData
-        except InputGuardrailTripwireTriggered as e:
-            attempt += 1
-            if attempt > max_retries:
-                break
-            correction = await Runner.run(
-                corrector,
-                (
-                    f"Generated CVData:\n{last_output}\n\n"
-                    f"Violations to fix:\n{str(e)}\n\n"
-                    f"Original CV:\n{cv_text}"
-                ),
-            )
-            last_output = correction.final_output
-            input_text = (
-                f"Previous version (correct the violations):\n{last_output}\n\n"
-                f"Original CV:\n{cv_text}\n\n"
-                f"Job Description:\n{job_description}\n\n"
-                f"Candidate Clarifications:\n{answers_text}"
-            )
+
+def _fact_source(cv_text: str, user_answers: List[dict]) -> str:
+    # What the generated CV may state: the original CV and the candidate's own answers.
+    return f"Original CV:\n{cv_text}\n\nCandidate Clarifications:\n{_answers_text(user_answers)}"
+
+
+async def _integrity_violations(
+    guard: Agent, source: str, facts: Dict[str, Any], client: AsyncOpenAI, labels: Dict[str, str]
+) -> List[str]:
+    local = check_integrity(source, facts)
+    if local.invented_terms or not local.ambiguous_terms:
+        INTEGRITY_CHECKS.labels(outcome="invented" if local.invented_terms else "valid").inc()
+        check: IntegrityCheckOutput = local
+    else:
+        INTEGRITY_CHECKS.labels(outcome="ambiguous").inc()
+        # Stable content first (original CV), generated content last.
+        check = await _complete_structured(
+            guard,
+            (
+                f"{source}\n\n"
+                f"Generated CVData:\n{json.dumps(facts, ensure_ascii=False)}\n\n"
+                f"Terms to verify:\n{', '.join(local.ambiguous_terms)}"
+            ),
+            client,
+            labels,
+        )
+    if check.valid:
+        return []
+    terms = ", ".join(check.invented_terms) or "unspecified"
+    return [f"Invented or altered content ({terms}): {check.reasoning}"]
+
+
+async def _review_cv(
+    source: str,
+    output: CVData,
+    integrity: Optional[asyncio.Future],
+    guard: Agent,
+    corrector: Agent,
+    client: AsyncOpenAI,
+    run_config: RunConfig,
+    labels: Dict[str, str],
+    max_retries: int,
+) -> CVData:
+    """
+    Check `output` and correct it until it passes or retries run out. `integrity` is
+    the already running check of the first candidate, if one was started.
+    """
+    for attempt in range(max_retries + 1):
+        if integrity is None:
+            facts = output.model_dump(mode="json", include=set(CV_FACT_FIELDS))
+            integrity = asyncio.ensure_future(_integrity_violations(guard, source, facts, client, labels))
+        violations = structure_violations(output) + await integrity
+        integrity = None
+        if not violations:
+            return output
+        if attempt == max_retries:
+            break
+
+        record_llm_retry(model=corrector.model, **labels)
+        # Stable content first (original CV), attempt-specific content last.
+        correction = await _run_agent(
+            corrector,
+            (
+                f"{source}\n\n"
+                f"Generated CVData:\n{output.model_dump_json()}\n\n"
+                f"Violations to fix:\n" + "\n".join(f"- {v}" for v in violations)
+            ),
+            run_config,
+            labels,
+        )
+        output = correction.final_output
 
     raise Exception("CV generation failed after maximum retries.")
+
+
+def _generate_cv_events(
+    cv_text: str,
+    job_description: str,
+    user_answers: List[dict],
+    api_key: Optional[str],
+    language: str,
+    provider: str,
+    template_id: str,
+    max_retries: int,
+    use_cache: bool,
+    endpoint: str,
+) -> AsyncIterator[StreamEvent]:
+    client = get_client(api_key, provider)
+    run_config = get_run_config(client)
+
+    model = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])["default_model"]
+    cv_agent = get_agent("cv", language, model, template_id)
+    guard = get_agent("integrity", language, model, template_id)
+    corrector = get_agent("corrector", language, model, template_id)
+
+    input_text = _cv_input(cv_text, job_description, user_answers)
+    source = _fact_source(cv_text, user_answers)
+    key = _response_key("generate-cv", cv_agent, input_text, language, template_id)
+    labels = _run_labels(provider, endpoint, language)
+
+    async def events() -> AsyncIterator[StreamEvent]:
+        cached = await _cached_output(key, CVData, use_cache)
+        if cached is not None:
+            for event in _replay_sections(cached, CV_STREAM_ARRAYS):
+                yield event
+            yield ("done", None, cached.model_dump(mode="json"))
+            return
+
+        scanner = JSONFieldStream(CV_STREAM_ARRAYS)
+        integrity: Optional[asyncio.Future] = None
+        try:
+            async for field, index, value in _stream_run(cv_agent, input_text, run_config, labels, scanner):
+                if field == "done":
+                    output = await _review_cv(
+                        source, value, integrity, guard, corrector, client, run_config, labels, max_retries
+                    )
+                    await _store_output(key, output)
+                    yield ("done", None, output.model_dump(mode="json"))
+                    return
+                if integrity is None and all(name in scanner.completed for name in CV_FACT_FIELDS):
+                    facts = {name: scanner.completed[name] for name in CV_FACT_FIELDS}
+                    integrity = asyncio.ensure_future(_integrity_violations(guard, source, facts, client, labels))
+                yield (field, index, value)
+        finally:
+            # Client went away or the run failed: don't leave the check running.
+            if integrity is not None:
+                integrity.cancel()
+
+    return events()
+
+
 # ============================================================
 # QUICK ANALYSIS
 # ============================================================
@@ -322,27 +830,75 @@ async def quick_analyze_cv(
     api_key: str,
     language: str = "pt-br",
     provider: str = "openai",
+    use_cache: bool = True,
 ) -> QuickAnalysisResponse:
     """Analyze CV vs Job Description quickly without full rewrite."""
     client = get_client(api_key, provider)
-    set_default_openai_client(client)
-    
-    config = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])
-    model = config["default_model"]
-    
-    language_name = SUPPORTED_LANGUAGES.get(language, "English")
-    
-    agent = Agent(
-        name="Quick Analyst",
-        model=model,
-        instructions=f"""
-        You are a hiring manager. Analyze if the CV matches the job description.
-        Provide a match score (0-100), a short summary report, and two lists: key strengths and missing requirements.
-        Output MUST be in {language_name}.
-        """,
-        output_type=QuickAnalysisResponse
-    )
-    
+
+    model = PROVIDER_CONFIG.get(provider, PROVIDER_CONFIG["openai"])["default_model"]
+    agent = get_agent("quick", language, model)
+
     input_text = f"CV Context:\n{cv_text}\n\nJob Description:\n{job_description}"
-    result = await Runner.run(agent, input_text)
-    return result.final_output
+    key = _response_key("quick-analyze", agent, input_text, language)
+    cached = await _cached_output(key, QuickAnalysisResponse, use_cache)
+    if cached is not None:
+        return cached
+
+    output = await _complete_structured(agent, input_text, client, _run_labels(provider, "quick-analyze", language))
+    await _store_output(key, output)
+    return output
+
+
+# ============================================================
+# BATCH QUICK ANALYSIS
+# ============================================================
+BATCH_MAX_JOBS = int(os.getenv("QUICK_BATCH_MAX_JOBS", "200"))
+BATCH_CONCURRENCY = int(os.getenv("QUICK_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("QUICK_BATCH_MAX_CONCURRENCY", "32"))
+
+# (job index, result, error): exactly one of result / error is set.
+BatchItem = Tuple[int, Optional[QuickAnalysisResponse], Optional[Exception]]
+
+
+def quick_analyze_batch(
+    cv_text: str,
+    job_descriptions: List[str],
+    api_key: Optional[str] = None,
+    language: str = "pt-br",
+    provider: str = "openai",
+    concurrency: int = BATCH_CONCURRENCY,
+    use_cache: bool = True,
+) -> AsyncIterator[BatchItem]:
+    """
+    Score one CV against many job descriptions. At most `concurrency` calls run at
+    once and each call waits for the provider's rate limiter. Results are yielded
+    in completion order; a failed job yields its error instead of aborting the batch.
+    """
+    get_client(api_key, provider)  # fail fast (401) before anything is scheduled
+    limiter = get_rate_limiter(provider)
+    concurrency = max(1, min(concurrency, BATCH_MAX_CONCURRENCY))
+
+    async def results() -> AsyncIterator[BatchItem]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def score(index: int, job_description: str) -> BatchItem:
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    result = await quick_analyze_cv(
+                        cv_text, job_description, api_key, language, provider, use_cache=use_cache
+                    )
+                    return index, result, None
+                except Exception as e:
+                    return index, None, e
+
+        tasks = [asyncio.ensure_future(score(i, jd)) for i, jd in enumerate(job_descriptions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client went away (or the batch finished): drop whatever is still queued.
+            for task in tasks:
+                task.cancel()
+
+    return results()
@@ -0,0 +1,68 @@
+"""
+Concurrency stress test for request-scoped LLM clients.
+
+Fires many concurrent quick-analysis calls with mixed providers and API keys
+against two local stub servers and checks that every response was served by
+the stub and key that its own request selected.
+
+Usage (from backend/):
+    python -m benchmarks.concurrency_stress --requests 500
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import ai_engine
+from benchmarks.stub_openai import serve_in_background
+
+
+async def _one_call(index: int, expected: dict) -> bool:
+    provider = random.choice(["openai", "gemini"])
+    api_key = f"tenant-{index % 37}"
+    result = await ai_engine.quick_analyze_cv(
+        cv_text=f"CV #{index}",
+        job_description=f"Job #{index}",
+        api_key=api_key,
+        language="en",
+        provider=provider,
+    )
+    return result.short_report == f"{expected[provider]}:{api_key}"
+
+
+async def run(total: int, concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    expected = {"openai": "stub-a", "gemini": "stub-b"}
+
+    async def guarded(i: int) -> bool:
+        async with semaphore:
+            return await _one_call(i, expected)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(guarded(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    mismatches = results.count(False)
+    print(f"{total} requests, concurrency {concurrency}: {elapsed:.2f}s "
+          f"({total / elapsed:.0f} req/s), {mismatches} served by the wrong client")
+    await ai_engine.CLIENT_REGISTRY.aclose()
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    with serve_in_background(9101, "stub-a") as url_a, serve_in_background(9102, "stub-b") as url_b:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url_a
+        ai_engine.PROVIDER_CONFIG["gemini"]["base_url"] = url_b
+        mismatches = asyncio.run(run(args.requests, args.concurrency))
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
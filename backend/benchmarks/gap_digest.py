@@ -0,0 +1,81 @@
+"""
+Size of the Gap Analyzer input with and without the local gap digest, and the
+cost of computing the digest.
+
+Usage (from backend/):
+    python -m benchmarks.gap_digest --entries 8
+"""
+import argparse
+import statistics
+import time
+
+from ai_engine import _gap_input
+from benchmarks.sample_cv import sample_cv
+from skills import build_gap_digest
+
+JOB_DESCRIPTION = """
+Senior Backend Engineer (Payments Platform)
+
+About us: we are a fast-growing fintech serving millions of customers across Latin America.
+Our engineering culture values ownership, pragmatic design and continuous learning.
+
+Responsibilities:
+- Design and build high-throughput REST APIs and event-driven services in Python (FastAPI or Django).
+- Own services end to end: design, implementation, observability and on-call.
+- Model data in PostgreSQL and tune queries for latency-sensitive payment flows.
+- Build streaming pipelines with Kafka and keep them reliable under peak load.
+- Collaborate with product, security and data teams in an Agile environment.
+
+Requirements:
+- 6+ years of backend experience with Python.
+- Solid knowledge of distributed systems, Docker and Kubernetes on AWS.
+- Experience with Terraform and CI/CD (GitHub Actions).
+- Familiarity with observability tooling such as Datadog, Prometheus or OpenTelemetry.
+
+Nice to have: GraphQL, Go, experience with PCI-DSS, Redis, DynamoDB.
+We offer remote-first work, health insurance and a yearly learning budget.
+"""
+
+
+def _cv_text(entries: int, bullets: int) -> str:
+    cv = sample_cv(entries, bullets)
+    c = cv.contact
+    lines = [c.name, f"{c.title} | {c.location} | {c.email} | {c.linkedin}", "", "SUMMARY", cv.summary, "", "SKILLS"]
+    lines += [f"{group.category}: {', '.join(group.items)}" for group in cv.skills]
+    lines += ["", "EXPERIENCE"]
+    for entry in cv.experience:
+        lines.append(f"{entry.job_title} — {entry.company}, {entry.location} ({entry.start_date} – {entry.end_date})")
+        lines += [f"• {bullet.text}" for bullet in entry.bullets]
+    lines += ["", "EDUCATION"]
+    lines += [f"{e.degree}, {e.institution} ({e.start_date} – {e.end_date})" for e in cv.education]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=8)
+    parser.add_argument("--bullets", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    cv_text = _cv_text(args.entries, args.bullets)
+    full = f"CV:\n{cv_text}\n\nJob Description:\n{JOB_DESCRIPTION}"
+    digest_input = _gap_input(cv_text, JOB_DESCRIPTION)
+
+    timings = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        digest = build_gap_digest(cv_text, JOB_DESCRIPTION)
+        timings.append(time.perf_counter() - started)
+
+    # ~4 characters per token is the usual estimate for English text.
+    print(f"full input:    {len(full):6d} chars (~{len(full) // 4} tokens)")
+    print(f"digest input:  {len(digest_input):6d} chars (~{len(digest_input) // 4} tokens), "
+          f"{100 * (1 - len(digest_input) / len(full)):.0f}% smaller")
+    print(f"pre-pass:      p50 {statistics.median(timings) * 1000:.2f} ms")
+    print(f"missing skills: {', '.join(digest.missing_skills) or '-'}")
+    print(f"missing contact fields: {', '.join(digest.missing_contact_fields) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
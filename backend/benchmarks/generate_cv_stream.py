@@ -0,0 +1,61 @@
+"""
+Time-to-first-content of /generate-cv versus /generate-cv/stream.
+
+Both paths call the same stub model, which emits tokens at a fixed pace, so
+the blocking call only returns once the whole CVData has been produced while
+the streamed call yields its first section after a handful of tokens.
+
+Usage (from backend/):
+    python -m benchmarks.generate_cv_stream --token-delay 0.02
+"""
+import argparse
+import asyncio
+import time
+
+import ai_engine
+from benchmarks.stub_openai import STUB_CV_TEXT, serve_in_background
+
+ANSWERS = [{"question": "Which databases?", "answer": "PostgreSQL"}]
+
+
+async def run(rounds: int) -> None:
+    blocking, first, full = [], [], []
+    for i in range(rounds):
+        kwargs = dict(cv_text=f"CV #{i}\n{STUB_CV_TEXT}", job_description="Backend engineer", user_answers=ANSWERS,
+                      api_key="bench", language="en", use_cache=False)
+
+        started = time.perf_counter()
+        await ai_engine.generate_cv(**kwargs)
+        blocking.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        first_at = None
+        sections = 0
+        async for field, _, _ in ai_engine.stream_generate_cv(**kwargs):
+            if first_at is None:
+                first_at = time.perf_counter() - started
+            if field != "done":
+                sections += 1
+        first.append(first_at)
+        full.append(time.perf_counter() - started)
+
+    avg = lambda values: sum(values) / len(values)
+    print(f"/generate-cv          full response:  {avg(blocking) * 1000:8.0f} ms")
+    print(f"/generate-cv/stream   first section:  {avg(first) * 1000:8.0f} ms")
+    print(f"/generate-cv/stream   done:           {avg(full) * 1000:8.0f} ms ({sections} sections)")
+    await ai_engine.CLIENT_REGISTRY.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    with serve_in_background(9103, "stub", token_delay=args.token_delay) as url:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url
+        asyncio.run(run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
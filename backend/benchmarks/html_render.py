@@ -0,0 +1,47 @@
+"""
+HTML rendering throughput of render_to_html over many CVData objects.
+
+Templates are compiled when exporters.html_renderer is imported, so that cost is
+reported separately from the per-CV render time. CVs vary in size and language.
+
+Usage (from backend/):
+    python -m benchmarks.html_render --cvs 10000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.sample_cv import sample_cv
+from templates import SECTION_TITLES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=10_000)
+    parser.add_argument("--template", default="classic")
+    args = parser.parse_args()
+
+    languages = sorted(SECTION_TITLES)
+    cvs = [(sample_cv(1 + i % 6, 2 + i % 4), languages[i % len(languages)]) for i in range(args.cvs)]
+
+    started = time.perf_counter()
+    from exporters.html_renderer import render_to_html
+    print(f"import + compile  {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    timings = []
+    total_bytes = 0
+    started = time.perf_counter()
+    for cv, language in cvs:
+        render_started = time.perf_counter()
+        html = render_to_html(cv, args.template, language)
+        timings.append((time.perf_counter() - render_started) * 1_000_000)
+        total_bytes += len(html)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.cvs} CVs         {elapsed * 1000:8.1f} ms total   {args.cvs / elapsed:8.0f} CVs/s")
+    print(f"per CV            median {statistics.median(timings):6.1f} µs   "
+          f"p95 {statistics.quantiles(timings, n=20)[-1]:6.1f} µs   avg {total_bytes / args.cvs / 1024:5.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
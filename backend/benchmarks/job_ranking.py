@@ -0,0 +1,126 @@
+"""
+Local pre-ranking vs. scoring every job with the LLM.
+
+Builds a synthetic corpus of job descriptions from several role families and
+ranks it against a CV from one family. Quality is recall@k of the CV's own
+family (the jobs an LLM scoring pass would rate highest). Cost is the number of
+quick-analysis LLM calls and their wall time against the stub server.
+
+Usage (from backend/):
+    python -m benchmarks.job_ranking --jobs 2000 --top-k 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import ai_engine
+from benchmarks.stub_openai import serve_in_background
+from ranking import JobIndex
+
+FAMILIES = {
+    "backend": ["python", "fastapi", "django", "postgresql", "redis", "kafka", "microservices", "rest apis", "aws"],
+    "frontend": ["react", "typescript", "next.js", "css", "accessibility", "redux", "webpack", "design systems"],
+    "data": ["pandas", "spark", "airflow", "sql", "dbt", "machine learning", "statistics", "tableau"],
+    "devops": ["kubernetes", "terraform", "ci/cd", "prometheus", "aws", "linux", "helm", "incident response"],
+    "mobile": ["kotlin", "swift", "android", "ios", "react native", "app store", "jetpack compose"],
+    "product": ["roadmaps", "stakeholders", "discovery", "okrs", "user research", "prioritization", "analytics"],
+}
+FILLER = ["collaborative team", "remote friendly", "fast-growing company", "competitive salary",
+          "hybrid work", "health insurance", "career growth", "international clients"]
+
+
+def _job(family: str, rng: random.Random) -> str:
+    skills = rng.sample(FAMILIES[family], k=5)
+    level = rng.choice(["Junior", "Mid-level", "Senior", "Staff"])
+    return (f"{level} {family} engineer. Requirements: {', '.join(skills)}. "
+            f"Nice to have: {rng.choice(FAMILIES[rng.choice(list(FAMILIES))])}. {', '.join(rng.sample(FILLER, 3))}.")
+
+
+def _cv(family: str, rng: random.Random) -> str:
+    return (f"Senior {family} engineer with 8 years of experience. Skills: {', '.join(FAMILIES[family])}. "
+            f"Worked with {rng.choice(FILLER)} and delivered projects end to end.")
+
+
+async def _score(cv_text: str, job_descriptions, concurrency: int) -> None:
+    async for _ in ai_engine.quick_analyze_batch(
+        cv_text, job_descriptions, "bench", "en", concurrency=concurrency, use_cache=False
+    ):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--llm-jobs", type=int, default=200, help="jobs scored by the LLM in the cost comparison")
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    labels = [rng.choice(list(FAMILIES)) for _ in range(args.jobs)]
+    jobs = [(f"job-{i}", _job(family, rng)) for i, family in enumerate(labels)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "job_index.npz")
+        started = time.perf_counter()
+        index = JobIndex(path)
+        index.add_many(jobs)
+        index.save()
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = JobIndex.load(path)
+        index.search("warm up", 1)
+        load = time.perf_counter() - started
+        size = os.path.getsize(path)
+
+    latencies, recalls = [], []
+    for _ in range(args.queries):
+        family = rng.choice(list(FAMILIES))
+        cv_text = _cv(family, rng)
+        started = time.perf_counter()
+        hits = index.search(cv_text, args.top_k)
+        latencies.append(time.perf_counter() - started)
+        relevant = sum(1 for job_id, _ in hits if labels[int(job_id.split("-")[1])] == family)
+        recalls.append(relevant / min(args.top_k, labels.count(family)))
+
+    print(f"index: {args.jobs} jobs, built in {build * 1000:.0f} ms, loaded in {load * 1000:.0f} ms, "
+          f"{size / 1024 / 1024:.1f} MB on disk")
+    print(f"search: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms, recall@{args.top_k} {statistics.mean(recalls):.3f}")
+
+    # The ranked run scores the jobs the index actually returns for this CV, and its
+    # time includes the search.
+    cv_text = _cv(rng.choice(list(FAMILIES)), rng)
+    texts_by_id = dict(jobs)
+    with serve_in_background(9106, "stub", latency=args.latency) as url:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url
+        texts = [text for _, text in jobs[:args.llm_jobs]]
+
+        async def compare():
+            started = time.perf_counter()
+            await _score(cv_text, texts, 16)
+            everything = time.perf_counter() - started
+
+            started = time.perf_counter()
+            top = [texts_by_id[job_id] for job_id, _ in index.search(cv_text, args.top_k)]
+            await _score(cv_text, top, 16)
+            ranked = time.perf_counter() - started
+
+            await ai_engine.CLIENT_REGISTRY.aclose()
+            return everything, ranked, len(top)
+
+        everything, ranked, top_count = asyncio.run(compare())
+
+    print(f"LLM scoring all {len(texts)} jobs: {everything:.2f}s, {len(texts)} calls")
+    print(f"search + LLM scoring top {top_count} jobs:  {ranked:.2f}s, {top_count} calls "
+          f"({len(texts) / max(top_count, 1):.0f}x fewer calls)")
+
+
+if __name__ == "__main__":
+    main()
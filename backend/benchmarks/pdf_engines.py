@@ -0,0 +1,76 @@
+"""
+Latency, memory and output size of every PDF engine on the same CVs.
+
+Each engine runs in a fresh process, so its RSS figures cover only its own imports,
+fonts and renders: "import" is the RSS after loading the engine, "peak" the maximum
+RSS after all renders. Engines whose dependencies cannot load here are reported and
+skipped.
+
+Usage (from backend/):
+    python -m benchmarks.pdf_engines --runs 20
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+
+from benchmarks.sample_cv import sample_cv
+from exporters import PDF_ENGINES, get_pdf_engine
+
+# (label, experience entries, bullets per entry)
+CV_SIZES = [("1 page", 2, 3), ("2 pages", 4, 4), ("5 pages", 12, 8)]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _bench_engine(name: str, runs: int, queue) -> None:
+    try:
+        engine = get_pdf_engine(name)
+    except (ImportError, OSError) as exc:
+        queue.put({"error": f"{type(exc).__name__}: {str(exc).splitlines()[0]}"})
+        return
+    result = {"import_mb": _rss_mb(), "sizes": []}
+    for label, entries, bullets in CV_SIZES:
+        cv = sample_cv(entries, bullets)
+        data = engine.render(cv)  # warm-up: fonts, stylesheets
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            engine.render(cv)
+            timings.append((time.perf_counter() - started) * 1000)
+        result["sizes"].append((label, statistics.median(timings), statistics.quantiles(timings, n=20)[-1], len(data)))
+    result["peak_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--engines", nargs="*", default=sorted(PDF_ENGINES))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for name in args.engines:
+        queue = context.Queue()
+        process = context.Process(target=_bench_engine, args=(name, args.runs, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+
+        if "error" in result:
+            print(f"{name:<11} unavailable ({result['error']})")
+            continue
+        print(f"{name:<11} RSS import {result['import_mb']:6.1f} MB   peak {result['peak_mb']:6.1f} MB")
+        for label, median, p95, size in result["sizes"]:
+            print(f"  {label:<8} median {median:8.1f} ms   p95 {p95:8.1f} ms   {size / 1024:7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
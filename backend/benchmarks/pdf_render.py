@@ -0,0 +1,53 @@
+"""
+PDF render latency of export_pdf versus the original rendering path.
+
+The "before" variant renders the same HTML the way export_pdf used to: CSS inlined in
+a <style> block that starts with the Google Fonts @import, WeasyPrint's default
+fetcher, and a fresh font configuration per document. In an egress-restricted
+network each of those renders waits for the font fetch to time out.
+
+Usage (from backend/):
+    python -m benchmarks.pdf_render --runs 20
+"""
+import argparse
+import statistics
+import time
+
+from weasyprint import HTML
+
+from benchmarks.sample_cv import sample_cv
+from exporters.pdf_exporter import _CSS, WeasyPrintEngine, render_to_html
+
+GOOGLE_FONTS_IMPORT = (
+    "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');\n"
+)
+
+
+def _render_before(cv) -> bytes:
+    html_string = render_to_html(cv).replace("</head>", f"<style>{GOOGLE_FONTS_IMPORT}{_CSS}</style></head>", 1)
+    return HTML(string=html_string).write_pdf()
+
+
+def _measure(label: str, render, cv, runs: int) -> None:
+    render(cv)  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render(cv)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{label:<30} median {statistics.median(timings):8.1f} ms   "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cv = sample_cv()
+    _measure("before (inline CSS + @import)", _render_before, cv, args.runs)
+    _measure("after (WeasyPrintEngine)", WeasyPrintEngine().render, cv, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Provider prompt-cache hit ratio for a typical session mix, as reported by the
+usage data of each response (the stub simulates OpenAI's prefix cache).
+
+One CV is scored against many jobs, gap-analyzed against a few of them and
+rewritten in two languages; ratios are read from PROMPT_CACHE_STATS.
+
+Usage (from backend/):
+    python -m benchmarks.prompt_cache --jobs 30
+"""
+import argparse
+import asyncio
+import json
+
+import ai_engine
+from benchmarks.gap_digest import JOB_DESCRIPTION, _cv_text
+from benchmarks.stub_openai import STUB_CV_TEXT, serve_in_background
+
+ANSWERS = [{"question": "Which observability tools have you used?", "answer": "Prometheus and Grafana"}]
+
+
+async def run(jobs: int) -> None:
+    cv_text = f"{_cv_text(8, 6)}\n{STUB_CV_TEXT}"
+    job_descriptions = [f"{JOB_DESCRIPTION}\nRequisition #{i}" for i in range(jobs)]
+    common = dict(api_key="bench", use_cache=False)
+
+    async for _ in ai_engine.quick_analyze_batch(cv_text, job_descriptions, language="en", **common):
+        pass
+    for jd in job_descriptions[:3]:
+        await ai_engine.analyze_gaps(cv_text, jd, language="en", **common)
+    for language in ("en", "pt-br"):
+        for _ in range(2):
+            await ai_engine.generate_cv(cv_text, job_descriptions[0], ANSWERS, language=language, **common)
+
+    print(json.dumps(ai_engine.PROMPT_CACHE_STATS.snapshot(), indent=2))
+    await ai_engine.CLIENT_REGISTRY.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=30)
+    args = parser.parse_args()
+
+    with serve_in_background(9108, "stub") as url:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url
+        asyncio.run(run(args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+One CV scored against many job descriptions: serial /quick-analyze calls
+versus a single quick_analyze_batch fan-out.
+
+Usage (from backend/):
+    python -m benchmarks.quick_batch --jobs 100 --latency 0.2 --concurrency 16
+"""
+import argparse
+import asyncio
+import time
+
+import ai_engine
+import llm_clients
+from benchmarks.stub_openai import serve_in_background
+
+
+async def run(jobs: int, concurrency: int) -> None:
+    job_descriptions = [f"Job #{i}: backend engineer, Python, PostgreSQL" for i in range(jobs)]
+
+    started = time.perf_counter()
+    for jd in job_descriptions:
+        await ai_engine.quick_analyze_cv("Candidate CV", jd, "bench", "en", use_cache=False)
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    first = None
+    ok = 0
+    async for _, result, error in ai_engine.quick_analyze_batch(
+        "Candidate CV", job_descriptions, "bench", "en", concurrency=concurrency, use_cache=False
+    ):
+        if first is None:
+            first = time.perf_counter() - started
+        ok += error is None
+    batch = time.perf_counter() - started
+
+    print(f"{jobs} jobs serial:                   {serial:7.2f}s")
+    print(f"{jobs} jobs batch (concurrency {concurrency:>3}): {batch:7.2f}s "
+          f"(first result after {first * 1000:.0f} ms, {ok} ok, {serial / batch:.1f}x faster)")
+    await ai_engine.CLIENT_REGISTRY.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=50.0, help="provider rate limit, requests per second")
+    args = parser.parse_args()
+
+    llm_clients.RATE_LIMITS["openai"] = (args.rate, args.concurrency)
+    with serve_in_background(9105, "stub", latency=args.latency) as url:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url
+        asyncio.run(run(args.jobs, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
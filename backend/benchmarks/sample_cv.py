@@ -0,0 +1,54 @@
+from schemas.cv import BulletPoint, ContactInfo, CVData, EducationEntry, ExperienceEntry, SkillGroup
+
+
+def sample_cv(experience_entries: int = 4, bullets_per_entry: int = 4) -> CVData:
+    """A realistic, fully populated CVData used by the rendering benchmarks."""
+    return CVData(
+        contact=ContactInfo(
+            name="Maria Oliveira",
+            title="Senior Backend Engineer",
+            email="maria.oliveira@example.com",
+            phone="+55 11 91234-5678",
+            location="São Paulo, Brazil",
+            linkedin="linkedin.com/in/maria-oliveira",
+            portfolio="mariaoliveira.dev",
+        ),
+        summary=(
+            "Backend engineer with nine years of experience designing distributed systems on AWS. "
+            "Led platform migrations, built event-driven pipelines and mentored engineering teams "
+            "in fast-growing e-commerce and fintech companies."
+        ),
+        skills=[
+            SkillGroup(category="Backend", items=["Python", "FastAPI", "Django", "Go"]),
+            SkillGroup(category="Data", items=["PostgreSQL", "Redis", "Kafka"]),
+            SkillGroup(category="Cloud", items=["AWS", "Kubernetes", "Terraform"]),
+        ],
+        experience=[
+            ExperienceEntry(
+                job_title="Senior Backend Engineer",
+                company=f"Company {i}",
+                location="São Paulo, Brazil",
+                start_date=f"0{1 + i % 9}/20{15 + i}",
+                end_date="Present" if i == 0 else f"0{2 + i % 8}/20{16 + i}",
+                bullets=[
+                    BulletPoint(text=(
+                        f"Led initiative {j} to migrate legacy services to Kubernetes on AWS, "
+                        "reducing p99 latency by 35% and cutting infrastructure cost by 20% "
+                        "across five product teams"
+                    ))
+                    for j in range(bullets_per_entry)
+                ],
+            )
+            for i in range(experience_entries)
+        ],
+        education=[
+            EducationEntry(
+                degree="BSc Computer Science",
+                institution="Universidade de São Paulo",
+                start_date="2010",
+                end_date="2014",
+            )
+        ],
+        optimization_report="Benchmark fixture.",
+        match_score=85,
+    )
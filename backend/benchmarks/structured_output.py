@@ -0,0 +1,65 @@
+"""
+Per-call overhead of the structured-output fast path vs. the agents Runner for
+the single-turn Quick Analyst.
+
+Both paths send the same instructions and JSON schema to a zero-latency stub
+server, so the difference is client-side orchestration cost.
+
+Usage (from backend/):
+    python -m benchmarks.structured_output --calls 300
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import ai_engine
+from benchmarks.stub_openai import serve_in_background
+
+INPUT_TEXT = "CV Context:\nSenior Python engineer.\n\nJob Description:\nBackend engineer, Python, AWS."
+
+
+async def _measure(call, calls: int):
+    for _ in range(10):  # warm up connections and schema caches
+        await call()
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(calls: int) -> None:
+    client = ai_engine.get_client("bench", "openai")
+    run_config = ai_engine.get_run_config(client)
+    agent = ai_engine.get_agent("quick", "en", ai_engine.PROVIDER_CONFIG["openai"]["default_model"])
+    labels = ai_engine._run_labels("openai", "quick-analyze", "en")
+
+    async def runner():
+        result = await ai_engine._run_agent(agent, INPUT_TEXT, run_config, labels)
+        return result.final_output
+
+    async def direct():
+        return await ai_engine._complete_structured(agent, INPUT_TEXT, client, labels)
+
+    assert await runner() == await direct()
+    for name, call in (("Runner.run", runner), ("fast path", direct)):
+        latencies = await _measure(call, calls)
+        print(f"{name:11s} p50 {statistics.median(latencies) * 1000:6.2f} ms, "
+              f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:6.2f} ms")
+    await ai_engine.CLIENT_REGISTRY.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    with serve_in_background(9111, "stub") as url:
+        ai_engine.PROVIDER_CONFIG["openai"]["base_url"] = url
+        asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
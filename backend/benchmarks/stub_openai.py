@@ -0,0 +1,185 @@
+"""
+Minimal OpenAI-compatible chat completions server used by the benchmarks.
+
+Every response echoes the stub's name and the caller's API key, so a
+benchmark can verify that a request was served by the client it expected.
+
+With `token_delay`, output is produced in 4-character "tokens" at that pace,
+so streamed (`stream: true`) and non-streamed calls take the same total time
+and only differ in when the first bytes arrive.
+
+Usage mimics OpenAI prompt caching: prompts of 1024+ tokens report as
+`cached_tokens` the longest prefix (in 128-token steps) already seen by this
+stub, so benchmarks can measure how cache-friendly a prompt layout is.
+
+Run standalone:
+    python -m benchmarks.stub_openai --port 9100 --name stub-a
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import StreamingResponse
+
+TOKEN_CHARS = 4
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+
+
+class PrefixCache:
+    """Remembers prompt prefixes at 128-token boundaries, like OpenAI's prompt cache."""
+
+    def __init__(self):
+        self._seen = set()
+
+    def usage(self, messages: list, completion_tokens: int) -> dict:
+        prompt = "".join(str(m.get("content") or "") for m in messages)
+        prompt_tokens = -(-len(prompt) // TOKEN_CHARS)
+        cached = 0
+        for tokens in range(CACHE_MIN_TOKENS, prompt_tokens + 1, CACHE_STEP_TOKENS):
+            digest = hashlib.sha256(prompt[:tokens * TOKEN_CHARS].encode("utf-8")).digest()
+            if digest in self._seen:
+                cached = tokens
+            self._seen.add(digest)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+
+# Original CV text that vouches for every fact of the fake CVData below, so the
+# local integrity check accepts it without a correction round.
+STUB_CV_TEXT = (
+    "Jane Doe — Engineer\n"
+    "Engineer at Acme (01/2020 – Present): Built things with Python.\n"
+    "BSc, Uni (2015 – 2019)"
+)
+
+
+def _fake_output(properties: dict, tag: str) -> dict:
+    """Build a JSON object that satisfies the requested structured-output schema."""
+    if "gaps" in properties:
+        return {"gaps": [{"question": f"Question {i} ({tag})", "reasoning": tag} for i in range(5)]}
+    if "invented_terms" in properties:
+        return {"valid": True, "invented_terms": [], "reasoning": tag}
+    if "missing_sections" in properties:
+        return {"valid": True, "missing_sections": [], "reasoning": tag}
+    if "contact" in properties:
+        return {
+            "contact": {"name": "Jane Doe", "title": "Engineer", "email": None, "phone": None,
+                        "location": None, "linkedin": None, "portfolio": None},
+            "summary": tag,
+            "skills": [{"category": "Backend", "items": ["Python"]}],
+            "experience": [{"job_title": "Engineer", "company": "Acme", "location": None,
+                            "start_date": "01/2020", "end_date": "Present",
+                            "bullets": [{"text": "Built things"}]}],
+            "education": [{"degree": "BSc", "institution": "Uni", "start_date": "2015", "end_date": "2019"}],
+            "optimization_report": tag,
+            "match_score": 80,
+        }
+    return {"match_score": 75, "short_report": tag, "key_strengths": ["Python"], "missing_requirements": []}
+
+
+def _stream_chunks(completion_id: str, model: str, content: str, token_delay: float, usage: Optional[dict]):
+    """Yield `content` as chat.completion.chunk SSE events, one token at a time."""
+    def chunk(delta: Optional[dict], finish_reason: Optional[str] = None, **extra) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def events():
+        yield chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), TOKEN_CHARS):
+            if token_delay:
+                await asyncio.sleep(token_delay)
+            yield chunk({"content": content[start:start + TOKEN_CHARS]})
+        yield chunk({}, "stop")
+        if usage is not None:
+            yield chunk(None, usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return events()
+
+
+def create_app(name: str, latency: float = 0.0, token_delay: float = 0.0) -> FastAPI:
+    app = FastAPI(title=f"Stub OpenAI ({name})")
+    prefix_cache = PrefixCache()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request, authorization: Optional[str] = Header(None)):
+        body = await request.json()
+        api_key = (authorization or "").removeprefix("Bearer ").strip()
+        schema = ((body.get("response_format") or {}).get("json_schema") or {}).get("schema") or {}
+        content = json.dumps(_fake_output(schema.get("properties", {}), f"{name}:{api_key}"))
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        usage = prefix_cache.usage(body.get("messages", []), -(-len(content) // TOKEN_CHARS))
+
+        if latency:
+            await asyncio.sleep(latency)
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            return StreamingResponse(
+                _stream_chunks(completion_id, body.get("model", "stub"), content, token_delay,
+                               usage if include_usage else None),
+                media_type="text/event-stream",
+            )
+        if token_delay:
+            await asyncio.sleep(token_delay * -(-len(content) // TOKEN_CHARS))
+
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    return app
+
+
+@contextmanager
+def serve_in_background(port: int, name: str, latency: float = 0.0, token_delay: float = 0.0):
+    """Run a stub server on 127.0.0.1:`port` in a daemon thread for the duration of the block."""
+    config = uvicorn.Config(create_app(name, latency, token_delay), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--name", default="stub")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.name, args.latency, args.token_delay), host="127.0.0.1", port=args.port)
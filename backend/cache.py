@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+# ============================================================
+# KEYS
+# ============================================================
+def cache_key(*parts: Any) -> str:
+    """Content-address `parts` with a SHA-256 over their canonical JSON form."""
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+class BaseCache:
+    """
+    Byte-value cache with TTL, entry-count and byte-size limits plus hit/miss counters.
+    Async code uses `aget`/`aset`, which keep disk-backed caches off the event loop.
+    """
+
+    # True for backends whose reads and writes do I/O (SQLite).
+    blocking = False
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._get(key)
+        return self._count(value)
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._set(key, value)
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        if self.blocking:
+            return await run_in_threadpool(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        if self.blocking:
+            await run_in_threadpool(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def _count(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._usage()
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def _usage(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+
+class NullCache(BaseCache):
+    """Cache that stores nothing. Used when a cache is disabled via env."""
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def _set(self, key: str, value: bytes) -> None:
+        pass
+
+    def _usage(self) -> Tuple[int, int]:
+        return 0, 0
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._size = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, created_at = entry
+        if self._expired(created_at, time.time()):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.time())
+        self._size += len(value)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+    def _usage(self) -> Tuple[int, int]:
+        return len(self._entries), self._size
+
+
+class SQLiteCache(BaseCache):
+    """On-disk LRU cache in a single SQLite file, shared by every worker on the host."""
+
+    blocking = True
+
+    def __init__(self, path: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        now = time.time()
+        if self._expired(created_at, now):
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return bytes(value)
+
+    def _set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now, now),
+        )
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        entries, size = self._usage()
+        while entries > self.max_entries or size > self.max_bytes:
+            # Evict least recently used rows in batches so a full cache isn't trimmed one row per query.
+            batch = max(1, entries - self.max_entries, entries // 10)
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (batch,),
+            )
+            entries, size = self._usage()
+
+    def _usage(self) -> Tuple[int, int]:
+        entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return entries, size
+
+
+class TieredCache(BaseCache):
+    """In-memory LRU in front of a disk tier; disk hits are promoted to memory."""
+
+    blocking = True
+
+    def __init__(self, memory: BaseCache, disk: BaseCache):
+        super().__init__(max_entries=disk.max_entries, max_bytes=disk.max_bytes, ttl_seconds=disk.ttl_seconds)
+        self.memory = memory
+        self.disk = disk
+
+    def _get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        # Memory hits are answered inline; only the disk tier goes to a thread.
+        value = self.memory.get(key)
+        if value is None:
+            value = await self.disk.aget(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return self._count(value)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self.memory.set(key, value)
+        await self.disk.aset(key, value)
+
+    def _usage(self) -> Tuple[int, int]:
+        disk = self.disk.stats()
+        return disk["entries"], disk["bytes"]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["memory"] = self.memory.stats()
+        stats["disk"] = self.disk.stats()
+        return stats
+
+
+# ============================================================
+# ENV FACTORY
+# ============================================================
+def make_cache(prefix: str, backend: str = "memory", path: Optional[str] = None, max_entries: int = 1024,
+               max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = None) -> BaseCache:
+    """
+    Build a cache from `<PREFIX>_BACKEND` (memory | sqlite | tiered | none), `<PREFIX>_PATH`,
+    `<PREFIX>_MAX_ENTRIES`, `<PREFIX>_MAX_BYTES` and `<PREFIX>_TTL`, falling back to the given defaults.
+    `tiered` keeps a memory LRU (`<PREFIX>_MEMORY_MAX_BYTES`) in front of the SQLite file.
+    """
+    backend = os.getenv(f"{prefix}_BACKEND", backend).lower()
+    ttl = os.getenv(f"{prefix}_TTL")
+    options = {
+        "max_entries": int(os.getenv(f"{prefix}_MAX_ENTRIES", max_entries)),
+        "max_bytes": int(os.getenv(f"{prefix}_MAX_BYTES", max_bytes)),
+        "ttl_seconds": float(ttl) if ttl else ttl_seconds,
+    }
+
+    if backend == "memory":
+        return MemoryCache(**options)
+    path = os.getenv(f"{prefix}_PATH", path or f".cache/{prefix.lower()}.sqlite3")
+    if backend == "sqlite":
+        return SQLiteCache(path, **options)
+    if backend == "tiered":
+        memory_options = dict(options, max_bytes=int(os.getenv(f"{prefix}_MEMORY_MAX_BYTES", options["max_bytes"] // 4)))
+        return TieredCache(MemoryCache(**memory_options), SQLiteCache(path, **options))
+    if backend == "none":
+        return NullCache(**options)
+    raise ValueError(f"Invalid {prefix}_BACKEND '{backend}'. Valid options: ['memory', 'sqlite', 'tiered', 'none']")
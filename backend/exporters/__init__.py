@@ -1,4 +1,27 @@
-from .docx_exporter import export_docx
-from .pdf_exporter import export_pdf
+import importlib
 
-__all__ = ["export_docx", "export_pdf"]
+# Names are resolved from their submodule on first access. A pool worker that
+# unpickles one exporter function then imports only that module, instead of
+# opening the artifact cache and loading every exporter's dependencies.
+_EXPORTS = {
+    "ARTIFACT_CACHE": ".artifact_cache",
+    "artifact_key": ".artifact_cache",
+    "export_docx": ".docx_exporter",
+    "PDF_ENGINES": ".pdf_engine",
+    "PDFEngine": ".pdf_engine",
+    "export_pdf": ".pdf_engine",
+    "get_pdf_engine": ".pdf_engine",
+    "pdf_engine_name": ".pdf_engine",
+}
+
+__all__ = ["ARTIFACT_CACHE", "PDF_ENGINES", "PDFEngine", "artifact_key", "export_docx", "export_pdf", "get_pdf_engine",
+           "pdf_engine_name"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,22 @@
+from cache import cache_key, make_cache
+from schemas.cv import CVData
+from .pdf_engine import pdf_engine_name
+
+# ─── Rendered artifact cache ─────────────────────────────────────────────────
+
+# Repeat downloads of an unchanged CV reuse the rendered bytes. Memory LRU in
+# front of a SQLite file by default; tune with the EXPORT_CACHE_* env vars.
+ARTIFACT_CACHE = make_cache(
+    "EXPORT_CACHE",
+    backend="tiered",
+    max_entries=512,
+    max_bytes=256 * 1024 * 1024,
+    ttl_seconds=7 * 24 * 3600,
+)
+
+
+def artifact_key(cv: CVData, template_id: str, language: str, fmt: str) -> str:
+    """Canonical hash of everything that determines the rendered file, PDF engine included."""
+    if fmt == "pdf":
+        fmt = f"pdf:{pdf_engine_name()}"
+    return cache_key(cv.model_dump(mode="json"), template_id, language, fmt)
@@ -0,0 +1,134 @@
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Tuple
+from urllib.request import urlopen
+
+if TYPE_CHECKING:
+    from weasyprint.text.fonts import FontConfiguration
+
+
+# ─── Bundled assets ──────────────────────────────────────────────────────────
+
+# Stylesheets reference bundled files as `smartcv-asset:<relative path>`; they are
+# served from memory by `local_url_fetcher`, so rendering never touches the network.
+ASSET_SCHEME = "smartcv-asset:"
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+
+_MIME_TYPES = {
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+}
+
+# Inter weights used by the CV stylesheets, by file stem.
+INTER_WEIGHTS = {
+    400: "Inter-Regular",
+    500: "Inter-Medium",
+    600: "Inter-SemiBold",
+    700: "Inter-Bold",
+}
+
+
+@lru_cache(maxsize=None)
+def _load_assets() -> Dict[str, Tuple[bytes, str]]:
+    """Read every bundled font into memory once per process."""
+    assets = {}
+    if not os.path.isdir(FONTS_DIR):
+        return assets
+    for filename in sorted(os.listdir(FONTS_DIR)):
+        mime_type = _MIME_TYPES.get(os.path.splitext(filename)[1].lower())
+        if mime_type:
+            with open(os.path.join(FONTS_DIR, filename), "rb") as f:
+                assets[f"fonts/{filename}"] = (f.read(), mime_type)
+    return assets
+
+
+def asset_bytes(path: str) -> bytes:
+    """Contents of a bundled asset, by the path `font_path` returns."""
+    return _load_assets()[path][0]
+
+
+def font_path(stem: str) -> str:
+    """Return the bundled asset path for a font file stem (e.g. "Inter-Bold"), or "" if missing."""
+    for extension in _MIME_TYPES:
+        path = f"fonts/{stem}{extension}"
+        if path in _load_assets():
+            return path
+    return ""
+
+
+@lru_cache(maxsize=None)
+def font_face_css() -> str:
+    """
+    `@font-face` rules for the bundled Inter weights. Weights whose files are not
+    bundled are skipped, so the stylesheet's fallback fonts are used instead.
+    """
+    rules = []
+    for weight, stem in INTER_WEIGHTS.items():
+        path = font_path(stem)
+        if path:
+            rules.append(
+                "@font-face {\n"
+                "    font-family: 'Inter';\n"
+                f"    font-weight: {weight};\n"
+                "    font-style: normal;\n"
+                f"    src: url('{ASSET_SCHEME}{path}');\n"
+                "}\n"
+            )
+    return "".join(rules)
+
+
+# ─── Font configuration ──────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def get_font_config() -> "FontConfiguration":
+    """
+    Process-wide FontConfiguration. Stylesheets are parsed against it once, so
+    @font-face files are registered a single time instead of on every render.
+    The pdf pool runs renders in worker processes by default, so each worker
+    process gets its own configuration.
+    """
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+# ─── URL fetcher ─────────────────────────────────────────────────────────────
+
+def _fetch_local(url: str) -> Tuple[bytes, str]:
+    if url.startswith(ASSET_SCHEME):
+        path = url[len(ASSET_SCHEME):]
+        if path not in _load_assets():
+            raise ValueError(f"Unknown bundled asset: {path}")
+        return _load_assets()[path]
+    if url.startswith("data:"):
+        # Inline data URLs are decoded locally by urllib, no network involved.
+        with urlopen(url) as response:
+            return response.read(), response.headers.get_content_type()
+    raise ValueError(f"Network access is disabled for PDF rendering: {url}")
+
+
+@lru_cache(maxsize=None)
+def get_url_fetcher():
+    """
+    WeasyPrint URL fetcher that serves bundled assets and data URLs from memory and
+    refuses everything else. Built on first use, so the pymupdf engine, which reads
+    the same assets, never loads WeasyPrint.
+    """
+    try:  # WeasyPrint >= 68 takes URLFetcher objects that return URLFetcherResponse
+        from weasyprint.urls import URLFetcher, URLFetcherResponse
+    except ImportError:  # Older releases take a plain callable that returns a dict.
+        def local_url_fetcher(url, timeout=10, ssl_context=None):
+            data, mime_type = _fetch_local(url)
+            return {"string": data, "mime_type": mime_type, "redirected_url": url}
+
+        return local_url_fetcher
+
+    class LocalAssetFetcher(URLFetcher):
+        def fetch(self, url, headers=None):
+            data, mime_type = _fetch_local(url)
+            return URLFetcherResponse(url, data, {"Content-Type": mime_type})
+
+    return LocalAssetFetcher()
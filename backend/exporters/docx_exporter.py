@@ -1,53 +1,88 @@
+from functools import lru_cache
 from io import BytesIO
-from typing import List
+from typing import List, Optional
 
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 
 from schemas.cv import CVData, ContactInfo, ExperienceEntry, EducationEntry, SkillGroup
-from templates import SECTION_TITLES
-
-
-# ─── Helpers ─────────────────────────────────────────────────────────────────
-
-def _set_run_font(run, size_pt: float, bold: bool = False, color: tuple = None):
-    run.bold = bold
-    run.font.size = Pt(size_pt)
+from templates import SECTION_TITLES, TEMPLATES
+
+
+# ─── Base template ───────────────────────────────────────────────────────────
+
+# Named styles of the base document, so renderers only pick a style per paragraph
+# or run instead of writing font properties into every run.
+_PARAGRAPH_STYLES = {
+    # name: (based on, size pt, bold, color, alignment, space before pt, space after pt); None inherits
+    "CV Name": ("Normal", 22, True, None, WD_ALIGN_PARAGRAPH.CENTER, 0, 2),
+    "CV Title": ("Normal", 11, None, (80, 80, 80), WD_ALIGN_PARAGRAPH.CENTER, None, 4),
+    "CV Contact": ("Normal", 9, None, (100, 100, 100), WD_ALIGN_PARAGRAPH.CENTER, None, 6),
+    "CV Section Heading": ("Normal", 9, True, (90, 90, 90), None, 10, 2),
+    "CV Summary": ("Normal", None, None, None, None, None, 6),
+    "CV Skill": ("Normal", None, None, None, None, None, 2),
+    "CV Entry": ("Normal", 11, True, None, None, 6, 1),
+    "CV Education": ("Normal", None, True, None, None, 4, 1),
+    "CV Dates": ("Normal", 9, None, (120, 120, 120), None, None, 2),
+    "CV Bullet": ("List Bullet", None, None, None, None, None, 1),
+}
+
+_CHARACTER_STYLES = {
+    # name: (size pt, bold, color)
+    "CV Skill Category": (None, True, None),
+    "CV Company": (10, False, (80, 80, 80)),  # not bold inside the bold "CV Entry" line
+}
+
+# Relationships of python-docx's default package that a CV never uses. Dropping them
+# (and the unused built-in styles) shrinks every export by ~0.8 MB of XML to parse and write.
+_UNUSED_RELS = {
+    "http://schemas.microsoft.com/office/2007/relationships/stylesWithEffects",
+    RT.CUSTOM_XML,
+    RT.THUMBNAIL,
+}
+
+
+def _set_font(font, size_pt: Optional[float], bold: Optional[bool], color: Optional[tuple]) -> None:
+    if bold is not None:
+        font.bold = bold
+    if size_pt:
+        font.size = Pt(size_pt)
     if color:
-        run.font.color.rgb = RGBColor(*color)
-
-
-def _add_horizontal_rule(doc: Document):
-    """Insert a thin bottom-border paragraph as a visual divider."""
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(2)
-    p.paragraph_format.space_after = Pt(4)
-    pPr = p._p.get_or_add_pPr()
-    pBdr = OxmlElement("w:pBdr")
-    bottom = OxmlElement("w:bottom")
-    bottom.set(qn("w:val"), "single")
-    bottom.set(qn("w:sz"), "4")
-    bottom.set(qn("w:space"), "1")
-    bottom.set(qn("w:color"), "CCCCCC")
-    pBdr.append(bottom)
-    pPr.append(pBdr)
+        font.color.rgb = RGBColor(*color)
 
 
 def _section_heading(doc: Document, title: str):
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(10)
-    p.paragraph_format.space_after = Pt(2)
-    run = p.add_run(title.upper())
-    _set_run_font(run, 9, bold=True, color=(90, 90, 90))
-
+    doc.add_paragraph(title.upper(), style="CV Section Heading")
+
+
+def _prune_styles(doc: Document) -> None:
+    """Keep only the defaults, the CV styles and the styles they are based on."""
+    styles = doc.styles.element
+    by_id = {style.styleId: style for style in styles.style_lst}
+    pending = [style for style in styles.style_lst if style.name_val.startswith("CV ") or style.default]
+    kept = set()
+    while pending:
+        style = pending.pop()
+        kept.add(style.styleId)
+        for tag in ("w:basedOn", "w:next", "w:link"):
+            related = style.find(qn(tag))
+            related_id = related.get(qn("w:val")) if related is not None else None
+            if related_id in by_id and related_id not in kept:
+                pending.append(by_id[related_id])
+    for style in styles.style_lst:
+        if style.styleId not in kept:
+            styles.remove(style)
+    latent = styles.find(qn("w:latentStyles"))
+    if latent is not None:
+        styles.remove(latent)
 
-# ─── Style Setup ─────────────────────────────────────────────────────────────
 
 def apply_styles(doc: Document, template_id: str = "classic") -> None:
-    """Configure global document margins and default paragraph font."""
+    """Configure page margins, the default font and the named CV styles."""
     section = doc.sections[0]
     section.top_margin = Inches(0.75)
     section.bottom_margin = Inches(0.75)
@@ -59,108 +94,89 @@ def apply_styles(doc: Document, template_id: str = "classic") -> None:
     font.name = "Calibri"
     font.size = Pt(10)
 
+    for name, (base, size, bold, color, alignment, before, after) in _PARAGRAPH_STYLES.items():
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = doc.styles[base]
+        _set_font(style.font, size, bold, color)
+        if alignment is not None:
+            style.paragraph_format.alignment = alignment
+        if before is not None:
+            style.paragraph_format.space_before = Pt(before)
+        style.paragraph_format.space_after = Pt(after)
+    doc.styles["CV Bullet"].paragraph_format.left_indent = Inches(0.2)
+
+    for name, (size, bold, color) in _CHARACTER_STYLES.items():
+        _set_font(doc.styles.add_style(name, WD_STYLE_TYPE.CHARACTER).font, size, bold, color)
+
+    _prune_styles(doc)
+
+
+@lru_cache(maxsize=None)
+def _base_template(template_id: str) -> bytes:
+    """Build a template's base .docx once per process; every export starts from a copy."""
+    doc = Document()
+    for rels in (doc.part.rels, doc.part.package.rels):
+        for rId, rel in list(rels.items()):
+            if rel.reltype in _UNUSED_RELS:
+                rels.pop(rId)
+    apply_styles(doc, template_id)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def new_document(template_id: str = "classic") -> Document:
+    """An in-memory clone of the template's base document."""
+    return Document(BytesIO(_base_template(template_id if template_id in TEMPLATES else "classic")))
+
 
 # ─── Section Renderers ───────────────────────────────────────────────────────
 
 def render_contact(doc: Document, contact: ContactInfo) -> None:
-    # Name
-    name_p = doc.add_paragraph()
-    name_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    name_p.paragraph_format.space_before = Pt(0)
-    name_p.paragraph_format.space_after = Pt(2)
-    name_run = name_p.add_run(contact.name)
-    _set_run_font(name_run, 22, bold=True)
-
-    # Title
+    doc.add_paragraph(contact.name, style="CV Name")
     if contact.title:
-        title_p = doc.add_paragraph()
-        title_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_p.paragraph_format.space_after = Pt(4)
-        title_run = title_p.add_run(contact.title)
-        _set_run_font(title_run, 11, color=(80, 80, 80))
-
-    # Contact line
-    parts = []
-    if contact.location:
-        parts.append(contact.location)
-    if contact.phone:
-        parts.append(contact.phone)
-    if contact.email:
-        parts.append(contact.email)
-    if contact.linkedin:
-        parts.append(contact.linkedin)
-    if contact.portfolio:
-        parts.append(contact.portfolio)
+        doc.add_paragraph(contact.title, style="CV Title")
 
+    parts = [contact.location, contact.phone, contact.email, contact.linkedin, contact.portfolio]
+    parts = [part for part in parts if part]
     if parts:
-        contact_p = doc.add_paragraph()
-        contact_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        contact_p.paragraph_format.space_after = Pt(6)
-        contact_run = contact_p.add_run("  ·  ".join(parts))
-        _set_run_font(contact_run, 9, color=(100, 100, 100))
+        doc.add_paragraph("  ·  ".join(parts), style="CV Contact")
 
 
 def render_summary(doc: Document, summary: str, title: str) -> None:
     _section_heading(doc, title)
-    p = doc.add_paragraph(summary)
-    p.paragraph_format.space_after = Pt(6)
-    p.runs[0].font.size = Pt(10)
+    doc.add_paragraph(summary, style="CV Summary")
 
 
 def render_skills(doc: Document, skills: List[SkillGroup], title: str) -> None:
     _section_heading(doc, title)
     for group in skills:
-        p = doc.add_paragraph()
-        p.paragraph_format.space_after = Pt(2)
-        cat_run = p.add_run(f"{group.category}: ")
-        _set_run_font(cat_run, 10, bold=True)
-        items_run = p.add_run(", ".join(group.items))
-        _set_run_font(items_run, 10)
+        p = doc.add_paragraph(style="CV Skill")
+        p.add_run(f"{group.category}: ", style="CV Skill Category")
+        p.add_run(", ".join(group.items))
 
 
 def render_experience(doc: Document, experience: List[ExperienceEntry], title: str) -> None:
     _section_heading(doc, title)
     for entry in experience:
         # Title line: bold job_title + normal " — Company, Location"
-        p = doc.add_paragraph()
-        p.paragraph_format.space_before = Pt(6)
-        p.paragraph_format.space_after = Pt(1)
-        title_run = p.add_run(entry.job_title)
-        _set_run_font(title_run, 11, bold=True)
+        p = doc.add_paragraph(entry.job_title, style="CV Entry")
         company_str = f"  —  {entry.company}"
         if entry.location:
             company_str += f", {entry.location}"
-        company_run = p.add_run(company_str)
-        _set_run_font(company_run, 10, color=(80, 80, 80))
-
-        # Dates
-        date_p = doc.add_paragraph(f"{entry.start_date} – {entry.end_date}")
-        date_p.paragraph_format.space_after = Pt(2)
-        _set_run_font(date_p.runs[0], 9, color=(120, 120, 120))
+        p.add_run(company_str, style="CV Company")
 
-        # Bullets
+        doc.add_paragraph(f"{entry.start_date} – {entry.end_date}", style="CV Dates")
         for bullet in entry.bullets:
-            bp = doc.add_paragraph(style="List Bullet")
-            bp.paragraph_format.left_indent = Inches(0.2)
-            bp.paragraph_format.space_after = Pt(1)
-            run = bp.add_run(bullet.text)
-            run.font.size = Pt(10)
+            doc.add_paragraph(bullet.text, style="CV Bullet")
 
 
 def render_education(doc: Document, education: List[EducationEntry], title: str) -> None:
     _section_heading(doc, title)
     for entry in education:
-        p = doc.add_paragraph()
-        p.paragraph_format.space_before = Pt(4)
-        p.paragraph_format.space_after = Pt(1)
-        degree_run = p.add_run(entry.degree)
-        _set_run_font(degree_run, 10, bold=True)
-        inst_run = p.add_run(f"  —  {entry.institution}")
-        _set_run_font(inst_run, 10, color=(80, 80, 80))
-
-        date_p = doc.add_paragraph(f"{entry.start_date} – {entry.end_date}")
-        date_p.paragraph_format.space_after = Pt(2)
-        _set_run_font(date_p.runs[0], 9, color=(120, 120, 120))
+        p = doc.add_paragraph(entry.degree, style="CV Education")
+        p.add_run(f"  —  {entry.institution}", style="CV Company")
+        doc.add_paragraph(f"{entry.start_date} – {entry.end_date}", style="CV Dates")
 
 
 # ─── Public API ──────────────────────────────────────────────────────────────
@@ -168,8 +184,7 @@ def render_education(doc: Document, education: List[EducationEntry], title: str)
 def export_docx(cv: CVData, template_id: str = "classic", language: str = "en") -> bytes:
     """Convert a CVData object to a .docx file and return the raw bytes."""
     titles = SECTION_TITLES.get(language, SECTION_TITLES["en"])
-    doc = Document()
-    apply_styles(doc, template_id)
+    doc = new_document(template_id)
     render_contact(doc, cv.contact)
     render_summary(doc, cv.summary, titles["summary"])
     render_skills(doc, cv.skills, titles["skills"])
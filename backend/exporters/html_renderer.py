@@ -0,0 +1,39 @@
+import os
+from typing import Dict
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+from schemas.cv import CVData
+from templates import SECTION_TITLES, TEMPLATES
+
+# ─── Compiled HTML templates ─────────────────────────────────────────────────
+
+# One `<template_id>.html` per CV template. Autoescaping covers every field, so
+# the templates never call an escape helper themselves.
+HTML_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_templates")
+
+_environment = Environment(
+    loader=FileSystemLoader(HTML_TEMPLATES_DIR),
+    autoescape=True,
+    undefined=StrictUndefined,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+)
+
+
+def _compile_templates() -> Dict[str, Template]:
+    """Compile every template once at import. Ids without their own HTML use "classic"."""
+    return {
+        template_id: _environment.select_template([f"{template_id}.html", "classic.html"])
+        for template_id in TEMPLATES
+    }
+
+
+_HTML_TEMPLATES = _compile_templates()
+
+
+def render_to_html(cv: CVData, template_id: str = "classic", language: str = "en") -> str:
+    template = _HTML_TEMPLATES.get(template_id, _HTML_TEMPLATES["classic"])
+    titles = SECTION_TITLES.get(language, SECTION_TITLES["en"])
+    return template.render(cv=cv, titles=titles, language=language)
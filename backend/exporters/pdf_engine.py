@@ -0,0 +1,53 @@
+import importlib
+import os
+from functools import lru_cache
+from typing import Optional
+
+from schemas.cv import CVData
+
+# ─── Engine interface ────────────────────────────────────────────────────────
+
+
+class PDFEngine:
+    """Renders a CVData to PDF bytes. Every engine must emit real, selectable vector text (ATS)."""
+
+    name = ""
+
+    def render(self, cv: CVData, template_id: str = "classic", language: str = "en") -> bytes:
+        raise NotImplementedError
+
+
+# Engine modules are imported on first use, so an engine's dependencies (WeasyPrint's
+# native libraries, for instance) are only needed when that engine is selected.
+PDF_ENGINES = {
+    "weasyprint": (".pdf_exporter", "WeasyPrintEngine"),
+    "pymupdf": (".pymupdf_exporter", "PyMuPDFEngine"),
+}
+
+
+def pdf_engine_name(name: Optional[str] = None) -> str:
+    """Resolve an engine name, defaulting to `PDF_ENGINE` (weasyprint)."""
+    name = (name or os.getenv("PDF_ENGINE", "weasyprint")).lower()
+    if name not in PDF_ENGINES:
+        raise ValueError(f"Invalid PDF_ENGINE '{name}'. Valid options: {sorted(PDF_ENGINES)}")
+    return name
+
+
+@lru_cache(maxsize=None)
+def _load_engine(name: str) -> PDFEngine:
+    module_name, class_name = PDF_ENGINES[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)()
+
+
+def get_pdf_engine(name: Optional[str] = None) -> PDFEngine:
+    """Return the process-wide instance of an engine (the `PDF_ENGINE` one by default)."""
+    return _load_engine(pdf_engine_name(name))
+
+
+# ─── Public API ──────────────────────────────────────────────────────────────
+
+def export_pdf(cv: CVData, template_id: str = "classic", language: str = "en",
+               engine: Optional[str] = None) -> bytes:
+    """Convert a CVData object to an ATS-friendly PDF with the selected engine."""
+    return get_pdf_engine(engine).render(cv, template_id, language)
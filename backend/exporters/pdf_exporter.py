@@ -1,16 +1,17 @@
-import html as html_lib
-from typing import List
+from functools import lru_cache
 
-from weasyprint import HTML as WeasyprintHTML
+from weasyprint import CSS, HTML as WeasyprintHTML
 
-from schemas.cv import CVData, ContactInfo, ExperienceEntry, EducationEntry, SkillGroup
-from templates import SECTION_TITLES
+from schemas.cv import CVData
+from .assets import font_face_css, get_font_config, get_url_fetcher
+from .html_renderer import render_to_html
+from .pdf_engine import PDFEngine
 
 # ─── CSS ─────────────────────────────────────────────────────────────────────
 
-_CSS = """
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
+# Inter is served from the bundled font files (see assets.py) instead of a
+# Google Fonts @import, so rendering works without network access.
+_CSS = font_face_css() + """
 @page {
     size: A4;
     margin: 15mm 18mm 14mm 18mm;
@@ -88,115 +89,33 @@ ul.bullets li { margin-bottom: 2pt; font-size: 10pt; }
 .edu-institution { font-size: 9.5pt; color: #555; }
 """
 
+# Stylesheet source per template id. Unknown ids fall back to "classic".
+_TEMPLATE_CSS = {
+    "classic": _CSS,
+}
 
-# ─── HTML builders ───────────────────────────────────────────────────────────
-
-def _e(text: str) -> str:
-    """HTML-escape a string."""
-    return html_lib.escape(str(text or ""))
 
+@lru_cache(maxsize=None)
+def get_stylesheet(template_id: str = "classic") -> CSS:
+    """Parse a template's CSS once per process and reuse it for every render."""
+    return CSS(
+        string=_TEMPLATE_CSS.get(template_id, _TEMPLATE_CSS["classic"]),
+        font_config=get_font_config(),
+        url_fetcher=get_url_fetcher(),
+    )
 
-def _render_contact(contact: ContactInfo) -> str:
-    parts = []
-    if contact.location:
-        parts.append(f"<span>{_e(contact.location)}</span>")
-    if contact.phone:
-        parts.append(f"<span>{_e(contact.phone)}</span>")
-    if contact.email:
-        parts.append(f"<span><a href='mailto:{_e(contact.email)}'>{_e(contact.email)}</a></span>")
-    if contact.linkedin:
-        parts.append(f"<span>{_e(contact.linkedin)}</span>")
-    if contact.portfolio:
-        parts.append(f"<span>{_e(contact.portfolio)}</span>")
 
-    contact_line = "".join(parts) if parts else ""
+# ─── Engine ──────────────────────────────────────────────────────────────────
 
-    title_html = f'<div class="title">{_e(contact.title)}</div>' if contact.title else ""
-    return f"""
-<div class="cv-header">
-  <h1>{_e(contact.name)}</h1>
-  {title_html}
-  <div class="contact-line">{contact_line}</div>
-</div>
-"""
+class WeasyPrintEngine(PDFEngine):
+    """CVData → HTML + CSS → WeasyPrint layout → PDF. Supports every stylesheet feature."""
 
+    name = "weasyprint"
 
-def _render_experience(experience: List[ExperienceEntry]) -> str:
-    entries = []
-    for exp in experience:
-        company_loc = _e(exp.company)
-        if exp.location:
-            company_loc += f", {_e(exp.location)}"
-
-        bullets_html = "".join(f"<li>{_e(b.text)}</li>" for b in exp.bullets)
-
-        entries.append(f"""
-<div class="experience-entry">
-  <div class="exp-title-line">
-    <span class="exp-title">{_e(exp.job_title)}</span>
-    <span class="exp-dates">{_e(exp.start_date)} – {_e(exp.end_date)}</span>
-  </div>
-  <div class="exp-company">{company_loc}</div>
-  <ul class="bullets">{bullets_html}</ul>
-</div>
-""")
-    return "\n".join(entries)
-
-
-def _render_education(education: List[EducationEntry]) -> str:
-    entries = []
-    for edu in education:
-        entries.append(f"""
-<div class="education-entry">
-  <div class="edu-title-line">
-    <span class="edu-degree">{_e(edu.degree)}</span>
-    <span class="edu-dates">{_e(edu.start_date)} – {_e(edu.end_date)}</span>
-  </div>
-  <div class="edu-institution">{_e(edu.institution)}</div>
-</div>
-""")
-    return "\n".join(entries)
-
-
-def render_to_html(cv: CVData, template_id: str = "classic", language: str = "en") -> str:
-    titles = SECTION_TITLES.get(language, SECTION_TITLES["en"])
-    
-    skills_html = []
-    for group in cv.skills:
-        items_str = ", ".join(_e(item) for item in group.items)
-        skills_html.append(f'<div class="skill-group"><span class="skill-category">{_e(group.category)}:</span> {items_str}</div>')
-    
-    skills_block = "".join(skills_html)
-
-    return f"""<!DOCTYPE html>
-<html lang="{_e(language)}">
-<head>
-  <meta charset="utf-8">
-  <style>{_CSS}</style>
-</head>
-<body>
-
-{_render_contact(cv.contact)}
-
-<div class="section-title">{_e(titles["summary"])}</div>
-<div class="summary"><p>{_e(cv.summary)}</p></div>
-
-<div class="section-title">{_e(titles["skills"])}</div>
-<div class="skills">{skills_block}</div>
-
-<div class="section-title">{_e(titles["experience"])}</div>
-{_render_experience(cv.experience)}
-
-<div class="section-title">{_e(titles["education"])}</div>
-{_render_education(cv.education)}
-
-</body>
-</html>"""
-
-
-# ─── Public API ──────────────────────────────────────────────────────────────
-
-def export_pdf(cv: CVData, template_id: str = "classic", language: str = "en") -> bytes:
-    """Convert a CVData object to an ATS-friendly PDF with real vector text."""
-    html_string = render_to_html(cv, template_id, language)
-    return WeasyprintHTML(string=html_string).write_pdf()
+    def render(self, cv: CVData, template_id: str = "classic", language: str = "en") -> bytes:
+        html_string = render_to_html(cv, template_id, language)
+        stylesheet = get_stylesheet(template_id if template_id in _TEMPLATE_CSS else "classic")
+        return WeasyprintHTML(string=html_string, url_fetcher=get_url_fetcher()).write_pdf(
+            stylesheets=[stylesheet],
+            font_config=get_font_config(),
+        )
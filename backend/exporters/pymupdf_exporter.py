@@ -0,0 +1,302 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pymupdf
+
+from schemas.cv import CVData, ContactInfo, EducationEntry, ExperienceEntry, SkillGroup
+from templates import SECTION_TITLES
+from .assets import asset_bytes, font_path
+from .pdf_engine import PDFEngine
+
+# ─── Page geometry ───────────────────────────────────────────────────────────
+
+# Mirrors the classic stylesheet in pdf_exporter.py: A4, 15/18/14/18 mm margins,
+# line-height 1.5. Every length below is in points.
+MM = 72 / 25.4
+PAGE_WIDTH, PAGE_HEIGHT = pymupdf.paper_size("a4")
+MARGIN_TOP, MARGIN_RIGHT, MARGIN_BOTTOM, MARGIN_LEFT = 15 * MM, 18 * MM, 14 * MM, 18 * MM
+LINE_HEIGHT = 1.5
+BULLET_INDENT = 14
+
+_TOKEN_RE = re.compile(r"(\s*)(\S*)")
+
+
+# ─── Fonts and styles ────────────────────────────────────────────────────────
+
+class _Style(NamedTuple):
+    font: str
+    size: float
+    color: str
+    spacing: float = 0  # letter-spacing
+
+
+NAME = _Style("bold", 22, "#1a1a1a", -0.5)
+TITLE = _Style("regular", 11, "#555555")
+CONTACT = _Style("regular", 9, "#666666")
+SEPARATOR = _Style("regular", 9, "#bbbbbb")
+SECTION = _Style("bold", 8.5, "#555555", 0.8)
+BODY = _Style("regular", 10.5, "#1a1a1a")
+SKILL = _Style("regular", 10, "#333333")
+SKILL_CATEGORY = _Style("semibold", 10, "#1a1a1a")
+EXP_TITLE = _Style("bold", 10.5, "#1a1a1a")
+EXP_COMPANY = _Style("regular", 10, "#555555")
+BULLET = _Style("regular", 10, "#1a1a1a")
+DATES = _Style("regular", 9, "#888888")
+EDU_DEGREE = _Style("semibold", 10, "#1a1a1a")
+EDU_INSTITUTION = _Style("regular", 9.5, "#555555")
+
+# Bundled Inter weights when present, otherwise MuPDF's built-in Helvetica
+# (Nimbus Sans), which covers every Latin script the templates support.
+_FONT_FILES = {
+    "regular": ("Inter-Regular", "helv"),
+    "semibold": ("Inter-SemiBold", "hebo"),
+    "bold": ("Inter-Bold", "hebo"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_fonts() -> Dict[str, pymupdf.Font]:
+    """Load the fonts once per process; the pdf pool gives every worker its own copy."""
+    fonts = {}
+    for key, (stem, builtin) in _FONT_FILES.items():
+        path = font_path(stem)
+        fonts[key] = pymupdf.Font(fontbuffer=asset_bytes(path)) if path else pymupdf.Font(builtin)
+    return fonts
+
+
+@lru_cache(maxsize=4096)
+def _glyph_width(font: str, char: str) -> float:
+    """Glyph advance in em. Font.text_length re-encodes every character, so widths are cached."""
+    return get_fonts()[font].glyph_advance(ord(char))
+
+
+def _rgb(color: str) -> Tuple[float, float, float]:
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+
+
+# ─── Layout ──────────────────────────────────────────────────────────────────
+
+# A run of text in one style, optionally linked (mailto:...).
+Run = Tuple[str, _Style, Optional[str]]
+
+
+class _Layout:
+    """
+    Single-column flow layout: paragraphs are word-wrapped and stacked top to
+    bottom, vertical margins collapse like CSS block margins, and a new page starts
+    when the next block does not fit.
+    """
+
+    def __init__(self) -> None:
+        self.fonts = get_fonts()
+        self.doc = pymupdf.open()
+        self.width = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+        self.page = None
+        self._new_page()
+
+    def _new_page(self) -> None:
+        self._flush()
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        self.writers: List[Tuple[str, pymupdf.TextWriter]] = []
+        self.y = MARGIN_TOP
+        self.margin = 0.0
+
+    def _flush(self) -> None:
+        # TextWriter colours a whole write, so a new writer starts at every colour change.
+        # Writers are flushed in order to keep the content stream in reading order for ATS.
+        if self.page is not None:
+            for color, writer in self.writers:
+                writer.write_text(self.page, color=_rgb(color))
+
+    def _measure(self, text: str, style: _Style) -> float:
+        return sum(_glyph_width(style.font, char) for char in text) * style.size + style.spacing * len(text)
+
+    def line_height(self, style: _Style) -> float:
+        return style.size * LINE_HEIGHT
+
+    def _draw(self, x: float, baseline: float, text: str, style: _Style) -> None:
+        if not self.writers or self.writers[-1][0] != style.color:
+            self.writers.append((style.color, pymupdf.TextWriter(self.page.rect)))
+        writer = self.writers[-1][1]
+        font = self.fonts[style.font]
+        if not style.spacing:
+            writer.append((x, baseline), text, font=font, fontsize=style.size)
+            return
+        for char in text:
+            writer.append((x, baseline), char, font=font, fontsize=style.size)
+            x += self._measure(char, style)
+
+    # ── Vertical flow ──
+
+    def space(self, points: float) -> None:
+        """Vertical margin before the next block; adjacent margins collapse to the largest."""
+        self.margin = max(self.margin, points)
+
+    def keep(self, height: float) -> None:
+        """Start a new page unless `height` points still fit below the pending margin."""
+        if self.y > MARGIN_TOP and self.y + self.margin + height > PAGE_HEIGHT - MARGIN_BOTTOM:
+            self._new_page()
+
+    def _advance(self, height: float) -> float:
+        self.keep(height)
+        if self.y > MARGIN_TOP:
+            self.y += self.margin
+        self.margin = 0.0
+        top = self.y
+        self.y += height
+        return top
+
+    # ── Paragraphs ──
+
+    def _wrap(self, runs: List[Run], width: float) -> List[List[list]]:
+        """Break runs into lines of [x, text, style, link] segments no wider than `width`."""
+        lines: List[List[list]] = [[]]
+        x = 0.0
+        space = False
+        for text, style, link in runs:
+            for gap, word in _TOKEN_RE.findall(text):
+                space = space or bool(gap)
+                if not word:
+                    continue
+                line = lines[-1]
+                gap_width = self._measure(" ", style) if space and line else 0.0
+                word_width = self._measure(word, style)
+                if line and x + gap_width + word_width > width:
+                    lines.append([])
+                    line, x, gap_width = lines[-1], 0.0, 0.0
+                last = line[-1] if line else None
+                if last and last[2] == style and last[3] == link:
+                    last[1] += (" " if gap_width else "") + word
+                else:
+                    line.append([x + gap_width, word, style, link])
+                x += gap_width + word_width
+                space = False
+        return [line for line in lines if line]
+
+    def paragraph(self, runs: List[Run], indent: float = 0, align: str = "left",
+                  right: Optional[Tuple[str, _Style]] = None, marker: Optional[Tuple[str, _Style]] = None) -> None:
+        """
+        Lay out one block of text. `right` is drawn right-aligned on the first line
+        (dates next to a job title), `marker` hangs in the indent of the first line (bullets).
+        """
+        width = self.width - indent
+        if right:
+            width -= self._measure(right[0], right[1]) + 8
+        for number, line in enumerate(self._wrap(runs, width)):
+            styles = [segment[2] for segment in line] + ([right[1]] if right and number == 0 else [])
+            height = max(self.line_height(style) for style in styles)
+            top = self._advance(height)
+            line_width = line[-1][0] + self._measure(line[-1][1], line[-1][2])
+            x0 = MARGIN_LEFT + indent + ((width - line_width) / 2 if align == "center" else 0)
+
+            def baseline(style: _Style) -> float:
+                font = self.fonts[style.font]
+                content = (font.ascender - font.descender) * style.size
+                return top + (height - content) / 2 + font.ascender * style.size
+
+            base = max(baseline(style) for style in styles)
+            if number == 0 and marker:
+                text, style = marker
+                self._draw(x0 - self._measure(text, style), base, text, style)
+            for x, text, style, link in line:
+                self._draw(x0 + x, base, text, style)
+                if link:
+                    rect = pymupdf.Rect(x0 + x, top, x0 + x + self._measure(text, style), top + height)
+                    self.page.insert_link({"kind": pymupdf.LINK_URI, "from": rect, "uri": link})
+            if number == 0 and right:
+                text, style = right
+                self._draw(PAGE_WIDTH - MARGIN_RIGHT - self._measure(text, style), base, text, style)
+
+    def finish(self, cv: CVData, language: str) -> bytes:
+        self._flush()
+        self.page = None
+        self.doc.set_metadata({"title": cv.contact.name, "author": cv.contact.name, "creator": "SmartCV"})
+        self.doc.set_language(language)
+        self.doc.subset_fonts()
+        data = self.doc.tobytes(garbage=3, deflate=True)
+        self.doc.close()
+        return data
+
+
+# ─── Sections ────────────────────────────────────────────────────────────────
+
+def _render_contact(layout: _Layout, contact: ContactInfo) -> None:
+    layout.paragraph([(contact.name, NAME, None)], align="center")
+    layout.space(3)
+    if contact.title:
+        layout.paragraph([(contact.title, TITLE, None)], align="center")
+        layout.space(5)
+
+    parts = [contact.location, contact.phone, contact.email, contact.linkedin, contact.portfolio]
+    runs: List[Run] = []
+    for part in filter(None, parts):
+        if runs:
+            runs.append((" · ", SEPARATOR, None))
+        runs.append((part, CONTACT, f"mailto:{part}" if part == contact.email else None))
+    if runs:
+        layout.paragraph(runs, align="center")
+    layout.space(24)  # margin-bottom + padding-bottom of .cv-header
+
+
+def _render_section_title(layout: _Layout, title: str) -> None:
+    layout.space(12)
+    # Keep the heading on the same page as the first line under it.
+    layout.keep(layout.line_height(SECTION) + 6 + layout.line_height(BODY))
+    layout.paragraph([(title.upper(), SECTION, None)])
+    layout.space(6)
+
+
+def _render_skills(layout: _Layout, skills: List[SkillGroup]) -> None:
+    for group in skills:
+        layout.paragraph([(f"{group.category}:", SKILL_CATEGORY, None), (" " + ", ".join(group.items), SKILL, None)])
+        layout.space(3)
+
+
+def _render_experience(layout: _Layout, experience: List[ExperienceEntry]) -> None:
+    for exp in experience:
+        company_loc = exp.company + (f", {exp.location}" if exp.location else "")
+        layout.keep(layout.line_height(EXP_TITLE) + layout.line_height(EXP_COMPANY) + 3 + layout.line_height(BULLET))
+        layout.paragraph([(exp.job_title, EXP_TITLE, None)], right=(f"{exp.start_date} – {exp.end_date}", DATES))
+        layout.paragraph([(company_loc, EXP_COMPANY, None)])
+        layout.space(3)
+        for bullet in exp.bullets:
+            layout.paragraph([(bullet.text, BULLET, None)], indent=BULLET_INDENT, marker=("•  ", BULLET))
+            layout.space(2)
+        layout.space(8)
+
+
+def _render_education(layout: _Layout, education: List[EducationEntry]) -> None:
+    for edu in education:
+        layout.keep(layout.line_height(EDU_DEGREE) + layout.line_height(EDU_INSTITUTION))
+        layout.paragraph([(edu.degree, EDU_DEGREE, None)], right=(f"{edu.start_date} – {edu.end_date}", DATES))
+        layout.paragraph([(edu.institution, EDU_INSTITUTION, None)])
+        layout.space(5)
+
+
+# ─── Engine ──────────────────────────────────────────────────────────────────
+
+class PyMuPDFEngine(PDFEngine):
+    """
+    Lays CVData out directly on PDF pages with PyMuPDF, skipping HTML and CSS layout.
+    Only the classic one-column design is implemented; text stays real, selectable
+    vector text with embedded font subsets.
+    """
+
+    name = "pymupdf"
+
+    def render(self, cv: CVData, template_id: str = "classic", language: str = "en") -> bytes:
+        titles = SECTION_TITLES.get(language, SECTION_TITLES["en"])
+        layout = _Layout()
+
+        _render_contact(layout, cv.contact)
+        _render_section_title(layout, titles["summary"])
+        layout.paragraph([(cv.summary, BODY, None)])
+        _render_section_title(layout, titles["skills"])
+        _render_skills(layout, cv.skills)
+        _render_section_title(layout, titles["experience"])
+        _render_experience(layout, cv.experience)
+        _render_section_title(layout, titles["education"])
+        _render_education(layout, cv.education)
+
+        return layout.finish(cv, language)
@@ -0,0 +1,203 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Set
+
+from pydantic import BaseModel
+
+from skills import CASE_SENSITIVE, CONTEXT_SKILLS, SKILL_GROUP, get_skill_matcher
+
+
+class IntegrityCheckOutput(BaseModel):
+    valid: bool
+    invented_terms: List[str]
+    reasoning: str
+
+
+class LocalIntegrityCheck(IntegrityCheckOutput):
+    # Terms the local rules cannot settle (rephrased titles, derived numbers...).
+    ambiguous_terms: List[str]
+
+
+# ============================================================
+# RULES
+# ============================================================
+# Dictionary skills that describe practices rather than technologies. The CV agent
+# may legitimately name a practice the original only describes ("Agile" for sprints),
+# so a new one is ambiguous instead of invented.
+PRACTICE_SKILLS = {
+    "Agile", "Scrum", "Kanban", "DevOps", "SRE", "System Design", "Event-Driven Architecture",
+    "TDD", "Unit Testing", "Microservices", "REST", "Application Security", "CI/CD", "Git",
+}
+
+# Skills a source skill vouches for: the language a framework or library is written
+# in, SQL for relational databases and warehouses, the platform a tool runs on.
+IMPLIED_SKILLS: Dict[str, Set[str]] = {
+    "Django": {"Python"}, "Flask": {"Python"}, "FastAPI": {"Python"},
+    "Pandas": {"Python"}, "NumPy": {"Python"}, "PyTorch": {"Python"}, "TensorFlow": {"Python"},
+    "scikit-learn": {"Python"}, "Airflow": {"Python"},
+    "Spring": {"Java"}, "Ruby on Rails": {"Ruby"}, "Laravel": {"PHP"}, ".NET": {"C#"},
+    "Node.js": {"JavaScript"}, "Express": {"JavaScript", "Node.js"}, "NestJS": {"TypeScript", "Node.js"},
+    "React": {"JavaScript", "HTML", "CSS"}, "Vue": {"JavaScript", "HTML", "CSS"},
+    "Angular": {"TypeScript", "HTML", "CSS"}, "Svelte": {"JavaScript", "HTML", "CSS"},
+    "Next.js": {"React", "JavaScript"}, "Redux": {"JavaScript"}, "React Native": {"React", "JavaScript"},
+    "Tailwind CSS": {"CSS"},
+    "PostgreSQL": {"SQL"}, "MySQL": {"SQL"}, "SQL Server": {"SQL"}, "Oracle": {"SQL"},
+    "Snowflake": {"SQL"}, "BigQuery": {"SQL", "GCP"}, "Databricks": {"Spark"}, "dbt": {"SQL"},
+    "DynamoDB": {"AWS"}, "SQS": {"AWS"}, "Serverless": {"AWS"},
+    "Kubernetes": {"Docker"}, "Helm": {"Kubernetes", "Docker"},
+    "GitHub Actions": {"CI/CD", "Git"}, "GitLab CI": {"CI/CD", "Git"}, "Jenkins": {"CI/CD"},
+    "Deep Learning": {"Machine Learning"}, "LLM": {"Machine Learning", "NLP"},
+}
+
+# Dictionary names that are also ordinary words or letters. Even after the matcher's
+# context rules a hit on one of them is not proof of an invented technology.
+WORD_LIKE_SKILLS = CASE_SENSITIVE | CONTEXT_SKILLS
+
+# Legal-form words that may be added or dropped from a company name without changing it.
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "ltda", "corp", "co", "sa", "s/a", "gmbh", "ag", "plc", "me", "eireli"}
+
+_NUMBER_RE = re.compile(r"(?<![\w.,])(\d(?:[\d.,]*\d)?)(\s?%)?")
+_WORD_RE = re.compile(r"[\w/&+#.-]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _number_keys(text: str) -> Iterable[str]:
+    # Separators are dropped so "1,000" / "1.000" and "1.5" / "1,5" compare equal across locales.
+    for match in _NUMBER_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(1))
+        yield digits + "%" if match.group(2) else digits
+
+
+def _words(text: str) -> Set[str]:
+    return {word.strip(".,-") for word in _WORD_RE.findall(text.casefold())} - {""}
+
+
+class _SourceFacts(NamedTuple):
+    text: str
+    words: Set[str]
+    # Canonical skill -> the forms it is written in ("unit tests", "elasticsearch").
+    skills: Dict[str, Set[str]]
+    # Skills the source implies without naming them (Python for Django).
+    implied: Set[str]
+    # Skill groups (languages, data stores...) the source covers, implied skills included.
+    groups: Set[str]
+    numbers: Set[str]
+
+
+@lru_cache(maxsize=64)
+def _source_facts(source_text: str) -> _SourceFacts:
+    """Facts of the original CV (plus clarifications), shared by every check of one generation."""
+    numbers = set(_number_keys(source_text))
+    skills: Dict[str, Set[str]] = {}
+    for start, end, skill in get_skill_matcher().find(source_text):
+        skills.setdefault(skill, set()).add(_normalize(source_text[start:end]))
+    implied: Set[str] = set()
+    pending = list(skills)
+    while pending:
+        for skill in IMPLIED_SKILLS.get(pending.pop(), ()):
+            if skill not in skills and skill not in implied:
+                implied.add(skill)
+                pending.append(skill)
+    return _SourceFacts(
+        text=_normalize(source_text),
+        words=_words(source_text),
+        skills=skills,
+        implied=implied,
+        groups={SKILL_GROUP[skill] for skill in skills.keys() | implied},
+        # A percentage in the source also vouches for the bare number and vice versa.
+        numbers=numbers | {key.rstrip("%") for key in numbers},
+    )
+
+
+# ============================================================
+# LOCAL INTEGRITY CHECK
+# ============================================================
+def check_integrity(source_text: str, generated: Dict[str, Any]) -> LocalIntegrityCheck:
+    """
+    Compare the facts of a generated CV (CVData fields as JSON-ready data) against the
+    original text: technologies, numbers and percentages, company names and job titles.
+    Percentages that never appear in the source are invented, and so are technologies
+    from a domain the source never touches (Kubernetes on a frontend-only CV). Skills the
+    source implies (Python for Django, SQL for PostgreSQL) pass; other unmatched facts are
+    ambiguous and left to the Integrity Validator.
+    """
+    source = _source_facts(source_text)
+    invented: List[str] = []
+    ambiguous: List[str] = []
+
+    def flag(terms: List[str], term: str) -> None:
+        if term not in terms:
+            terms.append(term)
+
+    experience = generated.get("experience") or []
+    prose = [generated.get("summary") or ""]
+    prose += [bullet["text"] for entry in experience for bullet in entry.get("bullets") or []]
+    skill_items = [item for group in generated.get("skills") or [] for item in group.get("items") or []]
+    titles = [entry["job_title"] for entry in experience]
+
+    matcher = get_skill_matcher()
+    for text in prose + skill_items + titles:
+        for start, end, skill in matcher.find(text):
+            written = text[start:end]
+            forms = source.skills.get(skill)
+            if forms is None:
+                if skill in source.implied:
+                    continue
+                # A new skill next to related ones in the source ("Rust" on a Go CV) may be a
+                # fair inference; only one from an unrelated domain is conclusive.
+                conclusive = (
+                    SKILL_GROUP[skill] not in source.groups
+                    and skill not in PRACTICE_SKILLS
+                    and skill not in WORD_LIKE_SKILLS
+                )
+                flag(invented if conclusive else ambiguous, written)
+            # Aliases share a label but can name different tools ("Pytest" for "unit tests",
+            # "OpenSearch" for "Elasticsearch"); only the source's forms or the canonical name pass.
+            elif _normalize(written) not in forms | {_normalize(skill)}:
+                flag(ambiguous, written)
+
+    # Skill items outside the dictionary must still appear in the source in some form.
+    for item in skill_items:
+        if not matcher.find(item) and _normalize(item) not in source.text:
+            flag(ambiguous, item)
+
+    for text in prose:
+        for key in _number_keys(text):
+            if key in source.numbers:
+                continue
+            if key.endswith("%") and key[:-1] not in source.numbers:
+                flag(invented, key)
+            else:
+                flag(ambiguous, key)
+
+    for entry in experience:
+        company = entry["company"]
+        if _normalize(company) in source.text:
+            continue
+        tokens = _words(company) - COMPANY_SUFFIXES
+        known = tokens & source.words
+        if tokens and not known:
+            flag(invented, company)
+        elif known != tokens:
+            flag(ambiguous, company)
+
+    # Titles are often translated or reformatted by the template, so a mismatch is never conclusive.
+    for title in titles:
+        if _normalize(title) not in source.text:
+            flag(ambiguous, title)
+
+    if invented:
+        reasoning = f"Not found in the original CV: {', '.join(invented)}."
+    elif ambiguous:
+        reasoning = f"Could not be verified locally: {', '.join(ambiguous)}."
+    else:
+        reasoning = "Every technology, number, company and job title appears in the original CV."
+    return LocalIntegrityCheck(
+        valid=not invented,
+        invented_terms=invented,
+        ambiguous_terms=ambiguous,
+        reasoning=reasoning,
+    )
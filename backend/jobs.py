@@ -0,0 +1,430 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Concurrent jobs per type and process; override with JOBS_<TYPE>_CONCURRENCY
+# (e.g. JOBS_GENERATE_CV_CONCURRENCY=8).
+JOB_CONCURRENCY = {
+    "generate-cv": 4,
+    "export-pdf": 2,
+    "export-docx": 4,
+}
+
+JOBS_PATH = os.getenv("JOBS_PATH", ".cache/jobs.sqlite3")
+JOBS_POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", "1"))
+# A process that has not checked in for this long is considered dead and its running jobs are taken over.
+JOBS_OWNER_TIMEOUT = float(os.getenv("JOBS_OWNER_TIMEOUT", "30"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_TTL_SECONDS = float(os.getenv("JOBS_TTL_SECONDS", str(24 * 3600)))
+JOBS_WEBHOOK_SECRET = os.getenv("JOBS_WEBHOOK_SECRET")
+# Comma-separated hosts webhooks may target (".example.com" also matches subdomains).
+# Listed hosts may resolve to private addresses; without a list, only public addresses are allowed.
+JOBS_WEBHOOK_ALLOWED_HOSTS = [h.strip().lower() for h in os.getenv("JOBS_WEBHOOK_ALLOWED_HOSTS", "").split(",") if h.strip()]
+WEBHOOK_ATTEMPTS = 3
+
+# (result bytes, media type)
+JobResult = Tuple[bytes, str]
+# handler(payload, api_key) -> result; api_key is only ever held in memory.
+JobHandler = Callable[[Dict[str, Any], Optional[str]], Awaitable[JobResult]]
+
+KEY_LOST = "The server restarted before this job finished. API keys are never stored, so the job must be resubmitted."
+
+
+class Job(BaseModel):
+    id: str
+    type: str
+    status: str  # queued | running | succeeded | failed
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    media_type: Optional[str] = None
+    webhook: Optional[str] = None  # delivery outcome: delivered | failed: <reason>
+
+
+# ============================================================
+# WEBHOOK TARGETS
+# ============================================================
+class WebhookURLError(ValueError):
+    """Raised when a webhook URL is malformed, unresolvable or points at a non-public address."""
+
+
+def _host_allowed(host: str) -> bool:
+    return any(host == entry or (entry.startswith(".") and host.endswith(entry)) for entry in JOBS_WEBHOOK_ALLOWED_HOSTS)
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    # is_global excludes private, loopback, link-local (cloud metadata), shared and reserved ranges.
+    return ip.is_global and not ip.is_multicast
+
+
+async def resolve_webhook(url: str) -> Tuple[httpx.URL, Dict[str, str], Dict[str, Any]]:
+    """
+    Validate a webhook URL and pin it to a checked address. Returns the URL with its
+    host replaced by that address, plus the Host header and TLS extensions that keep
+    the original name, so a DNS change between check and delivery cannot redirect it.
+    """
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL:
+        raise WebhookURLError("webhook_url is not a valid URL")
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise WebhookURLError("webhook_url must be an http(s) URL")
+    host = parsed.host.lower()
+    if JOBS_WEBHOOK_ALLOWED_HOSTS and not _host_allowed(host):
+        raise WebhookURLError(f"webhook_url host {host} is not in JOBS_WEBHOOK_ALLOWED_HOSTS")
+
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise WebhookURLError(f"webhook_url host {host} cannot be resolved")
+    addresses = [info[4][0] for info in infos]
+    if not JOBS_WEBHOOK_ALLOWED_HOSTS and not all(_is_public(address) for address in addresses):
+        raise WebhookURLError("webhook_url must resolve to a public address")
+
+    extensions = {"sni_hostname": host} if parsed.scheme == "https" else {}
+    return parsed.copy_with(host=addresses[0].split("%", 1)[0]), {"Host": parsed.netloc.decode("ascii")}, extensions
+
+
+# ============================================================
+# STORE
+# ============================================================
+_JOB_COLUMNS = "id, type, status, created_at, started_at, finished_at, attempts, error, media_type, webhook_status"
+
+
+def _job(row: tuple) -> Job:
+    return Job(**dict(zip(Job.model_fields, row)))
+
+
+class JobStore:
+    """
+    Jobs in one SQLite file, shared by every API process on the host. Each process
+    checks in as an owner; running jobs of an owner that stopped checking in go
+    back to the queue. Jobs that need an API key can only run in the process that
+    received the key, so they fail instead when that process is gone.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                media_type TEXT,
+                webhook_status TEXT,
+                payload TEXT NOT NULL,
+                needs_key INTEGER NOT NULL,
+                owner TEXT,
+                webhook_url TEXT,
+                result BLOB
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (type, status, created_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS owners (owner TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+
+    def create(self, job_type: str, payload: Dict[str, Any], needs_key: bool, owner: str,
+               webhook_url: Optional[str]) -> Job:
+        job = Job(id=uuid.uuid4().hex, type=job_type, status="queued", created_at=time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, type, status, created_at, payload, needs_key, owner, webhook_url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job_type, job.status, job.created_at, json.dumps(payload, ensure_ascii=False),
+                 int(needs_key), owner if needs_key else None, webhook_url),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def result(self, job_id: str) -> Optional[JobResult]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, media_type FROM jobs WHERE id = ? AND status = 'succeeded'", (job_id,)
+            ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def webhook_url(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT webhook_url FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def claim(self, job_type: str, owner: str) -> Optional[Tuple[Job, Dict[str, Any], bool]]:
+        """Atomically take the oldest runnable job of `job_type`: (job, payload, needs_key)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT id, payload, needs_key FROM jobs
+                    WHERE type = ? AND (needs_key = 0 OR owner = ?)
+                      AND (status = 'queued' OR (status = 'running'
+                           AND owner NOT IN (SELECT owner FROM owners WHERE seen_at >= ?)))
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (job_type, owner, now - JOBS_OWNER_TIMEOUT),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, started_at = ?, attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (owner, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if row is None:
+                return None
+            job = self._conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (row[0],)).fetchone()
+        return _job(job), json.loads(row[1]), bool(row[2])
+
+    def finish(self, job_id: str, result: JobResult) -> None:
+        data, media_type = result
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', finished_at = ?, result = ?, media_type = ?, error = NULL "
+                "WHERE id = ?",
+                (time.time(), data, media_type, job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                (time.time(), error, job_id),
+            )
+
+    def requeue(self, job_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'",
+                                   [(job_id,) for job_id in job_ids])
+
+    def set_webhook_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (status, job_id))
+
+    def check_in(self, owner: str) -> List[str]:
+        """
+        Record that `owner` is alive, drop expired jobs, and fail key-bound jobs whose
+        owning process is gone. Returns the ids of the jobs failed that way.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO owners (owner, seen_at) VALUES (?, ?)", (owner, now))
+            self._conn.execute("DELETE FROM owners WHERE seen_at < ?", (now - JOBS_TTL_SECONDS,))
+            self._conn.execute("DELETE FROM jobs WHERE finished_at < ?", (now - JOBS_TTL_SECONDS,))
+            orphans = [row[0] for row in self._conn.execute(
+                """
+                SELECT id FROM jobs
+                WHERE needs_key = 1 AND status IN ('queued', 'running')
+                  AND owner NOT IN (SELECT owner FROM owners WHERE seen_at >= ?)
+                """,
+                (now - JOBS_OWNER_TIMEOUT,),
+            )]
+            self._conn.executemany(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                [(now, KEY_LOST, job_id) for job_id in orphans],
+            )
+        return orphans
+
+    def check_out(self, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM owners WHERE owner = ?", (owner,))
+
+
+# ============================================================
+# QUEUE
+# ============================================================
+class JobQueue:
+    """
+    Background workers for durable jobs: `JOB_CONCURRENCY[type]` workers per job
+    type poll the store, so a burst of one job type cannot starve the others.
+    Results are read back from the store; an optional webhook is called when a
+    job finishes.
+    """
+
+    def __init__(self, store: JobStore, concurrency: Dict[str, int]):
+        self.store = store
+        self.concurrency = concurrency
+        self.owner = uuid.uuid4().hex
+        self._handlers: Dict[str, JobHandler] = {}
+        self._keys: Dict[str, str] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._active: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._notifications: Set[asyncio.Task] = set()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        if job_type not in self.concurrency:
+            raise KeyError(f"Unknown job type '{job_type}'. Valid options: {list(self.concurrency.keys())}")
+        self._handlers[job_type] = handler
+
+    def submit(self, job_type: str, payload: Dict[str, Any], api_key: Optional[str] = None,
+               webhook_url: Optional[str] = None) -> Job:
+        if job_type not in self._handlers:
+            raise KeyError(f"No handler registered for job type '{job_type}'.")
+        job = self.store.create(job_type, payload, api_key is not None, self.owner, webhook_url)
+        if api_key is not None:
+            self._keys[job.id] = api_key
+        if job_type in self._wakeups:
+            self._wakeups[job_type].set()
+        return job
+
+    async def start(self) -> None:
+        self._http = httpx.AsyncClient(timeout=10.0, follow_redirects=False)
+        for job_id in self.store.check_in(self.owner):
+            self._schedule_notify(job_id)
+        self._tasks.append(asyncio.create_task(self._janitor()))
+        for job_type in self._handlers:
+            self._wakeups[job_type] = asyncio.Event()
+            for _ in range(self.concurrency[job_type]):
+                self._tasks.append(asyncio.create_task(self._worker(job_type)))
+
+    async def stop(self) -> None:
+        """Stop the workers. Interrupted jobs go back to the queue, or fail if they held an API key."""
+        for task in [*self._tasks, *self._notifications]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._notifications, return_exceptions=True)
+        self._tasks.clear()
+        self.store.requeue([job_id for job_id in self._active if job_id not in self._keys])
+        for job_id in self._active & self._keys.keys():
+            self.store.fail(job_id, KEY_LOST)
+        self._active.clear()
+        self._keys.clear()
+        self.store.check_out(self.owner)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _janitor(self) -> None:
+        while True:
+            await asyncio.sleep(JOBS_POLL_SECONDS)
+            for job_id in self.store.check_in(self.owner):
+                self._schedule_notify(job_id)
+
+    async def _worker(self, job_type: str) -> None:
+        wakeup = self._wakeups[job_type]
+        while True:
+            claimed = self.store.claim(job_type, self.owner)
+            if claimed is None:
+                # Jobs submitted to another process are only noticed on the next poll.
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), JOBS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            job, payload, needs_key = claimed
+            self._active.add(job.id)
+            await self._run(job, payload, needs_key)
+            # Only reached when the job was not interrupted by stop().
+            self._active.discard(job.id)
+            self._keys.pop(job.id, None)
+            self._schedule_notify(job.id)
+
+    async def _run(self, job: Job, payload: Dict[str, Any], needs_key: bool) -> None:
+        api_key = self._keys.get(job.id)
+        if needs_key and api_key is None:
+            self.store.fail(job.id, KEY_LOST)
+        elif job.attempts > JOBS_MAX_ATTEMPTS:
+            self.store.fail(job.id, f"Gave up after {JOBS_MAX_ATTEMPTS} interrupted attempts.")
+        else:
+            try:
+                self.store.finish(job.id, await self._handlers[job.type](payload, api_key))
+            except Exception as e:
+                self.store.fail(job.id, str(e))
+
+    def _schedule_notify(self, job_id: str) -> None:
+        task = asyncio.create_task(self._notify(job_id))
+        self._notifications.add(task)
+        task.add_done_callback(self._notifications.discard)
+
+    async def _notify(self, job_id: str) -> None:
+        """POST the finished job's status to its webhook, retrying with backoff."""
+        url = self.store.webhook_url(job_id)
+        job = self.store.get(job_id)
+        if not url or job is None or self._http is None:
+            return
+        body = json.dumps(job_status(job), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if JOBS_WEBHOOK_SECRET:
+            digest = hmac.new(JOBS_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-SmartCV-Signature"] = f"sha256={digest}"
+
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1))
+            try:
+                target, host_header, extensions = await resolve_webhook(url)
+                response = await self._http.post(
+                    target, content=body, headers={**headers, **host_header}, extensions=extensions
+                )
+            except WebhookURLError as e:
+                outcome = f"failed: {e}"
+                continue
+            except httpx.HTTPError as e:
+                outcome = f"failed: {type(e).__name__}"
+                continue
+            if response.status_code < 300:
+                outcome = "delivered"
+                break
+            outcome = f"failed: HTTP {response.status_code}"
+        self.store.set_webhook_status(job_id, outcome)
+
+
+def job_status(job: Job) -> Dict[str, Any]:
+    """Public view of a job, as served by GET /jobs/{id} and sent to webhooks."""
+    status = job.model_dump(exclude={"media_type"})
+    if job.status == "succeeded":
+        status["result_url"] = f"/jobs/{job.id}/result"
+    return status
+
+
+def _concurrency_from_env() -> Dict[str, int]:
+    return {
+        job_type: int(os.getenv(f"JOBS_{job_type.upper().replace('-', '_')}_CONCURRENCY", default))
+        for job_type, default in JOB_CONCURRENCY.items()
+    }
+
+
+JOB_QUEUE = JobQueue(JobStore(JOBS_PATH), _concurrency_from_env())
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+
+# ============================================================
+# CLIENT POOL CONFIG
+# ============================================================
+MAX_CLIENTS = int(os.getenv("LLM_MAX_CLIENTS", "64"))
+CLIENT_TTL_SECONDS = float(os.getenv("LLM_CLIENT_TTL", "900"))
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("LLM_HTTP2", "true").lower() != "false"
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT", "600"))
+
+# Evicted clients may still be handed to a request that has not started yet, so
+# they are kept for a grace period at least as long as one request may take.
+# After it they are closed as soon as their last in-flight response is.
+EVICTION_GRACE_SECONDS = float(os.getenv("LLM_CLIENT_EVICTION_GRACE", REQUEST_TIMEOUT_SECONDS + 60))
+
+ClientKey = Tuple[str, Optional[str], str]
+
+
+def _hash_api_key(api_key: str) -> str:
+    # Keys are held only as digests so the registry never exposes raw secrets.
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _TrackedAsyncClient(httpx.AsyncClient):
+    """
+    httpx client that counts requests whose response body has not been closed yet,
+    streamed ones included, so a retired client is never closed under a running LLM
+    call. Counting wraps `send`, so the transport (and httpx's proxy handling from the
+    environment) stays the default one.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        self.in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.in_flight -= 1
+                if self.in_flight == 0 and self._idle is not None:
+                    self._idle.set()
+
+        try:
+            response = await super().send(request, **kwargs)
+        except BaseException:
+            release()
+            raise
+        if response.is_closed:  # not streamed: the body was read inside send()
+            release()
+        else:
+            response.stream = _TrackedStream(response.stream, release)
+        return response
+
+    async def wait_idle(self) -> None:
+        while self.in_flight:
+            self._idle = asyncio.Event()
+            await self._idle.wait()
+
+
+class ClientRegistry:
+    """LRU/TTL registry of AsyncOpenAI clients keyed by (provider, base_url, hashed api key)."""
+
+    def __init__(self, max_clients: int = MAX_CLIENTS, ttl_seconds: float = CLIENT_TTL_SECONDS):
+        self.max_clients = max_clients
+        self.ttl_seconds = ttl_seconds
+        self._clients: "OrderedDict[ClientKey, Tuple[AsyncOpenAI, float]]" = OrderedDict()
+        self._retiring: Dict[AsyncOpenAI, Optional[asyncio.Task]] = {}
+        self._http_clients: Dict[AsyncOpenAI, _TrackedAsyncClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, provider: str, base_url: Optional[str], api_key: str) -> AsyncOpenAI:
+        key = (provider, base_url, _hash_api_key(api_key))
+        now = time.monotonic()
+
+        entry = self._clients.get(key)
+        if entry is not None:
+            client, last_used = entry
+            if now - last_used <= self.ttl_seconds:
+                self._clients[key] = (client, now)
+                self._clients.move_to_end(key)
+                return client
+            del self._clients[key]
+            self._retire(client)
+
+        http_client = _build_http_client()
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        self._http_clients[client] = http_client
+        self._clients[key] = (client, now)
+        self._evict(now)
+        return client
+
+    def _evict(self, now: float) -> None:
+        expired = [k for k, (_, last_used) in self._clients.items() if now - last_used > self.ttl_seconds]
+        for key in expired:
+            client, _ = self._clients.pop(key)
+            self._retire(client)
+        while len(self._clients) > self.max_clients:
+            _, (client, _) = self._clients.popitem(last=False)
+            self._retire(client)
+
+    def _retire(self, client: AsyncOpenAI) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop (e.g. a script): nothing can be in flight, close on aclose().
+            self._retiring[client] = None
+            return
+        self._retiring[client] = loop.create_task(self._close_later(client))
+
+    async def _close_later(self, client: AsyncOpenAI) -> None:
+        await asyncio.sleep(EVICTION_GRACE_SECONDS)
+        await self._http_clients[client].wait_idle()
+        self._retiring.pop(client, None)
+        self._http_clients.pop(client, None)
+        await client.close()
+
+    async def aclose(self) -> None:
+        """Close every pooled and retiring client. Called from the FastAPI lifespan on shutdown."""
+        clients = [client for client, _ in self._clients.values()]
+        self._clients.clear()
+        for client, task in self._retiring.items():
+            if task is not None:
+                task.cancel()
+            clients.append(client)
+        self._retiring.clear()
+        self._http_clients.clear()
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+
+def _build_http_client() -> _TrackedAsyncClient:
+    return _TrackedAsyncClient(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=5.0),
+        follow_redirects=True,
+    )
+
+
+CLIENT_REGISTRY = ClientRegistry()
+
+
+# ============================================================
+# PER-PROVIDER RATE LIMITING
+# ============================================================
+# (requests per second, burst) per provider; a rate of 0 disables limiting.
+# Override with LLM_RATE_LIMIT_<PROVIDER> and LLM_RATE_BURST_<PROVIDER>.
+RATE_LIMITS = {
+    "openai": (10.0, 20),
+    "gemini": (5.0, 10),
+    "ollama": (0.0, 0),
+}
+
+
+class TokenBucket:
+    """
+    Async token bucket. `acquire()` reserves a token immediately and sleeps until
+    it is due, so waiters are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+_RATE_LIMITERS: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    limiter = _RATE_LIMITERS.get(provider)
+    if limiter is None:
+        rate, burst = RATE_LIMITS.get(provider, RATE_LIMITS["openai"])
+        limiter = _RATE_LIMITERS[provider] = TokenBucket(
+            rate=float(os.getenv(f"LLM_RATE_LIMIT_{provider.upper()}", rate)),
+            burst=int(os.getenv(f"LLM_RATE_BURST_{provider.upper()}", burst)),
+        )
+    return limiter
@@ -1,9 +1,17 @@
+import asyncio
+from contextlib import asynccontextmanager
 from io import BytesIO
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends
+from itertools import islice
+import json
+import re
+import time
+import zipfile
+from fastapi import FastAPI, HTTPException, Header, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 import uvicorn
 import sys
 import os
@@ -11,12 +19,42 @@ import os
 # Add local directory to path so relative imports resolve correctly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from pdf_processor import extract_text_from_pdf
-from ai_engine import analyze_gaps, generate_cv, quick_analyze_cv, GapAnalysisItem, QuickAnalysisResponse, PROVIDER_CONFIG
+from pdf_processor import (
+    spool_upload,
+    start_page_extraction,
+    iter_extracted_pages,
+    get_cached_pdf_text,
+    cache_pdf_text,
+    PDFLimitError,
+    PDFUploadError,
+    PDF_TEXT_CACHE,
+)
+from llm_clients import CLIENT_REGISTRY
+from ai_engine import analyze_gaps, generate_cv, quick_analyze_cv, quick_analyze_batch, stream_analyze_gaps, stream_generate_cv, stream_quick_analyze_cv, warm_agent_cache, get_client, GapAnalysisItem, QuickAnalysisResponse, PROVIDER_CONFIG, RESPONSE_CACHE, PROMPT_CACHE_STATS, BATCH_CONCURRENCY, BATCH_MAX_JOBS
 from schemas.cv import CVData
-from exporters import export_docx, export_pdf
-
-app = FastAPI(title="SmartCV API", version="2.0.0")
+from exporters import export_docx, export_pdf, pdf_engine_name, ARTIFACT_CACHE, artifact_key
+from workers import PoolSaturatedError, run_in_pool, start_pools, shutdown_pools
+from streaming import sse_event
+from ranking import JOB_INDEX, rank_texts
+from metrics import EXTRACT_PAGES, EXTRACT_SECONDS, RENDER_SECONDS, observe, render_latest
+from jobs import JOB_QUEUE, WebhookURLError, job_status, resolve_webhook
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail at startup on an invalid PDF_ENGINE rather than with a bare 500 from the
+    # export endpoints, which resolve it (via artifact_key) before their error handling.
+    pdf_engine_name()
+    start_pools()
+    warm_agent_cache()
+    await JOB_QUEUE.start()
+    yield
+    await JOB_QUEUE.stop()
+    await CLIENT_REGISTRY.aclose()
+    shutdown_pools()
+
+
+app = FastAPI(title="SmartCV API", version="2.0.0", lifespan=lifespan)
 
 # ============================================================
 # ======================= CORS ===============================
@@ -28,6 +66,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # ============================================================
@@ -47,6 +86,87 @@ async def get_api_key(
     return x_model_api_key, provider
 
 
+async def use_response_cache(x_cache_bypass: Optional[str] = Header(None)) -> bool:
+    """`X-Cache-Bypass: true` forces a fresh LLM call; the fresh result still refreshes the cache."""
+    return (x_cache_bypass or "").lower() not in ("1", "true", "yes")
+
+
+# ============================================================
+# ================= WORKER POOL ERRORS =======================
+# ============================================================
+
+def pool_saturated(e: PoolSaturatedError) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+# ============================================================
+# ==================== ETAG HELPERS ==========================
+# ============================================================
+
+def make_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+
+def etag_candidates(if_none_match: Optional[str]) -> List[str]:
+    """Entity tags listed in an If-None-Match header, with weak `W/` prefixes dropped."""
+    if not if_none_match:
+        return []
+    return [tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`, as in RFC 9110."""
+    candidates = etag_candidates(if_none_match)
+    return "*" in candidates or etag in candidates
+
+
+# ============================================================
+# ============ SERVER-SENT EVENTS HELPERS ====================
+# ============================================================
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Stream `(field, index, value)` events from ai_engine as SSE: one `section`
+    event per completed field or array entry, then `done` with the full output.
+    Failures after the stream has started are reported as an `error` event.
+    """
+    async def event_source():
+        try:
+            async for field, index, value in events:
+                if field == "done":
+                    yield sse_event("done", value)
+                else:
+                    section = {"field": field, "value": value}
+                    if index is not None:
+                        section["index"] = index
+                    yield sse_event("section", section)
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class CleanupStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose background task always runs, even when the client
+    disconnects before or while the body is streamed (Starlette skips it then).
+    The task should be an async function that never suspends, so it still runs to
+    completion while the request task is being cancelled.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        background, self.background = self.background, None
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if background is not None:
+                await background()
+
+
 # ============================================================
 # ================= REQUEST MODELS ===========================
 # ============================================================
@@ -63,6 +183,28 @@ class QuickAnalysisRequest(BaseModel):
     language: str = "pt-br"
 
 
+class QuickAnalysisBatchRequest(BaseModel):
+    cv_text: str
+    job_descriptions: List[str] = []
+    language: str = "pt-br"
+    concurrency: int = BATCH_CONCURRENCY
+    top_k: Optional[int] = None
+
+
+class IndexedJob(BaseModel):
+    id: str
+    text: str
+
+
+class JobIndexRequest(BaseModel):
+    jobs: List[IndexedJob]
+
+
+class JobSearchRequest(BaseModel):
+    cv_text: str
+    top_k: int = 10
+
+
 class UserAnswer(BaseModel):
     question: str
     answer: str
@@ -82,26 +224,154 @@ class ExportRequest(BaseModel):
     template_id: str = "classic"
 
 
+class GenerateCVJobRequest(GenerateCVRequest):
+    webhook_url: Optional[str] = None
+
+
+class ExportJobRequest(ExportRequest):
+    webhook_url: Optional[str] = None
+
+
+class ExportBatchItem(ExportRequest):
+    format: Literal["pdf", "docx"] = "pdf"
+    filename: Optional[str] = None  # without extension; defaults to the candidate's name
+
+
+class ExportBatchRequest(BaseModel):
+    items: List[ExportBatchItem]
+
+
 # ============================================================
 # ====================== ENDPOINTS ===========================
 # ============================================================
 
-@app.post("/extract-text")
-async def extract_text_endpoint(file: UploadFile = File(...)):
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only .pdf files are supported")
+# The upload is parsed from the request stream by spool_upload, so the multipart
+# body is declared for the OpenAPI schema only.
+PDF_UPLOAD_BODY = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {"type": "object", "properties": {"file": {"type": "string", "format": "binary"}}},
+            },
+        },
+    },
+}
+
+
+@app.post("/extract-text", openapi_extra=PDF_UPLOAD_BODY)
+async def extract_text_endpoint(
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Extract text from an uploaded PDF. The response carries an ETag derived from the
+    PDF bytes; a client that still holds the text can send it back as `If-None-Match`
+    (with or without the file) and receives `304 Not Modified` while it stays cached.
+    """
+    path = None
+    try:
+        upload = await spool_upload(request)
+        if upload is None:
+            for etag in etag_candidates(if_none_match):
+                if await get_cached_pdf_text(etag.strip('"')) is not None:
+                    return Response(status_code=304, headers={"ETag": etag})
+            raise PDFUploadError("A .pdf file is required")
+        path, digest = upload
+        etag = make_etag(digest)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        cached = await get_cached_pdf_text(digest)
+        if cached is not None:
+            return JSONResponse({"text": cached["text"]}, headers={"ETag": etag})
+
+        raw_pages, cleaned_pages = [], []
+        with observe(EXTRACT_SECONDS, endpoint="extract-text"):
+            async for _, raw_text, cleaned in iter_extracted_pages(await start_page_extraction(path)):
+                raw_pages.append(raw_text)
+                if cleaned:
+                    cleaned_pages.append(cleaned)
+        EXTRACT_PAGES.labels(endpoint="extract-text").inc(len(raw_pages))
+        text = " ".join(cleaned_pages)
+        await cache_pdf_text(digest, "".join(raw_pages), text)
+        return JSONResponse({"text": text}, headers={"ETag": etag})
+    except PDFUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PDFLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if path:
+            os.unlink(path)
+
+
+@app.post("/extract-text/stream", openapi_extra=PDF_UPLOAD_BODY)
+async def extract_text_stream_endpoint(request: Request):
+    """
+    Extract text page by page, streamed back as NDJSON:
+    one `{"page": n, "text": "..."}` line per page, then `{"done": true, "pages": n}`.
+    Pages are extracted in parallel on the extract pool and emitted in order.
+    """
+    path = None
     try:
-        file_bytes = await file.read()
-        text = extract_text_from_pdf(file_bytes)
-        return {"text": text}
+        upload = await spool_upload(request)
+        if upload is None:
+            raise PDFUploadError("A .pdf file is required")
+        path, digest = upload
+        jobs = await start_page_extraction(path)
     except Exception as e:
+        # On success the response's cleanup task owns (and deletes) the temp file.
+        if path:
+            os.unlink(path)
+        if isinstance(e, PDFUploadError):
+            raise HTTPException(status_code=400, detail=str(e))
+        if isinstance(e, PDFLimitError):
+            raise HTTPException(status_code=413, detail=str(e))
+        if isinstance(e, PoolSaturatedError):
+            raise pool_saturated(e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def ndjson_pages():
+        raw_pages, cleaned_pages = [], []
+        try:
+            with observe(EXTRACT_SECONDS, endpoint="extract-text/stream"):
+                async for number, raw_text, cleaned in iter_extracted_pages(jobs):
+                    raw_pages.append(raw_text)
+                    if cleaned:
+                        cleaned_pages.append(cleaned)
+                    yield json.dumps({"page": number, "text": cleaned}, ensure_ascii=False) + "\n"
+            EXTRACT_PAGES.labels(endpoint="extract-text/stream").inc(len(raw_pages))
+            await cache_pdf_text(digest, "".join(raw_pages), " ".join(cleaned_pages))
+            yield json.dumps({"done": True, "pages": len(raw_pages)}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    pages = ndjson_pages()
+
+    async def cleanup():
+        # Runs even if the client went away before the body was iterated: close the
+        # generator, cancel page ranges that have not started, and delete the upload.
+        await pages.aclose()
+        for _, future in jobs:
+            future.cancel()
+        os.unlink(path)
+
+    return CleanupStreamingResponse(
+        pages,
+        media_type="application/x-ndjson",
+        headers={"ETag": make_etag(digest)},
+        background=BackgroundTask(cleanup),
+    )
+
 
 @app.post("/analyze-gaps", response_model=List[GapAnalysisItem])
 async def analyze_gaps_endpoint(
     request: AnalyzeGapsRequest,
     api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
 ):
     api_key, provider = api_auth
     try:
@@ -111,6 +381,7 @@ async def analyze_gaps_endpoint(
             api_key=api_key,
             language=request.language,
             provider=provider,
+            use_cache=use_cache,
         )
         return gaps
     except RuntimeError as e:
@@ -119,10 +390,38 @@ async def analyze_gaps_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/analyze-gaps/stream")
+async def analyze_gaps_stream_endpoint(
+    request: AnalyzeGapsRequest,
+    api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
+):
+    """
+    Same as /analyze-gaps, streamed as Server-Sent Events: one `section` event per
+    GapAnalysisItem (`field` is "gaps", with its `index`), then `done` with `{"gaps": [...]}`.
+    """
+    api_key, provider = api_auth
+    try:
+        events = stream_analyze_gaps(
+            cv_text=request.cv_text,
+            job_description=request.job_description,
+            api_key=api_key,
+            language=request.language,
+            provider=provider,
+            use_cache=use_cache,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return sse_response(events)
+
+
 @app.post("/quick-analyze", response_model=QuickAnalysisResponse)
 async def quick_analyze_endpoint(
     request: QuickAnalysisRequest,
     api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
 ):
     api_key, provider = api_auth
     try:
@@ -132,6 +431,7 @@ async def quick_analyze_endpoint(
             api_key=api_key,
             language=request.language,
             provider=provider,
+            use_cache=use_cache,
         )
         return result
     except RuntimeError as e:
@@ -140,10 +440,130 @@ async def quick_analyze_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/quick-analyze/stream")
+async def quick_analyze_stream_endpoint(
+    request: QuickAnalysisRequest,
+    api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
+):
+    """
+    Same as /quick-analyze, streamed as Server-Sent Events: one `section` event per
+    QuickAnalysisResponse field as soon as it is complete, then `done` with the full response.
+    """
+    api_key, provider = api_auth
+    try:
+        events = stream_quick_analyze_cv(
+            cv_text=request.cv_text,
+            job_description=request.job_description,
+            api_key=api_key,
+            language=request.language,
+            provider=provider,
+            use_cache=use_cache,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return sse_response(events)
+
+
+@app.post("/quick-analyze/batch")
+async def quick_analyze_batch_endpoint(
+    request: QuickAnalysisBatchRequest,
+    api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
+):
+    """
+    Score one CV against many job descriptions, streamed back as NDJSON in completion order:
+    `{"index": i, "result": {...}}` or `{"index": i, "error": "..."}` per job,
+    then `{"done": true, "succeeded": n, "failed": m}`.
+
+    With `top_k`, the jobs are first pre-ranked locally (TF-IDF cosine similarity)
+    and only the best `top_k` are sent to the LLM; each line then also carries the
+    pre-rank `similarity`. Without `job_descriptions`, `top_k` jobs are taken from
+    the persisted job index and lines carry their `job_id` instead of `index`.
+    """
+    if request.top_k is not None and request.top_k <= 0:
+        raise HTTPException(status_code=400, detail="top_k must be positive")
+    if not request.job_descriptions and request.top_k is None:
+        raise HTTPException(status_code=400, detail="job_descriptions must not be empty")
+    if len(request.job_descriptions) > BATCH_MAX_JOBS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_JOBS} job descriptions per batch")
+
+    # Each entry labels one scored job in the output: {"index": i} or {"job_id": id}, plus "similarity".
+    if request.top_k is None:
+        labels = [{"index": i} for i in range(len(request.job_descriptions))]
+        job_descriptions = request.job_descriptions
+    elif request.job_descriptions:
+        ranked = rank_texts(request.cv_text, request.job_descriptions, request.top_k)
+        labels = [{"index": i, "similarity": round(score, 4)} for i, score in ranked]
+        job_descriptions = [request.job_descriptions[i] for i, _ in ranked]
+    else:
+        ranked = JOB_INDEX.search(request.cv_text, min(request.top_k, BATCH_MAX_JOBS))
+        labels = [{"job_id": job_id, "similarity": round(score, 4)} for job_id, score in ranked]
+        job_descriptions = [JOB_INDEX.text(job_id) for job_id, _ in ranked]
+
+    api_key, provider = api_auth
+    try:
+        results = quick_analyze_batch(
+            cv_text=request.cv_text,
+            job_descriptions=job_descriptions,
+            api_key=api_key,
+            language=request.language,
+            provider=provider,
+            concurrency=request.concurrency,
+            use_cache=use_cache,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def ndjson_results():
+        succeeded = failed = 0
+        async for index, result, error in results:
+            if error is None:
+                succeeded += 1
+                line = {**labels[index], "result": result.model_dump()}
+            else:
+                failed += 1
+                line = {**labels[index], "error": str(error)}
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+        yield json.dumps({"done": True, "succeeded": succeeded, "failed": failed}) + "\n"
+
+    return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+
+
+@app.post("/job-index")
+async def job_index_add_endpoint(request: JobIndexRequest):
+    """Add or replace job descriptions in the persisted pre-ranking index."""
+    written = JOB_INDEX.add_many((job.id, job.text) for job in request.jobs)
+    JOB_INDEX.save()
+    return {"indexed": written, "size": len(JOB_INDEX)}
+
+
+@app.delete("/job-index/{job_id}")
+async def job_index_remove_endpoint(job_id: str):
+    if not JOB_INDEX.remove(job_id):
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' is not indexed")
+    JOB_INDEX.save()
+    return {"removed": job_id, "size": len(JOB_INDEX)}
+
+
+@app.post("/job-index/search")
+async def job_index_search_endpoint(request: JobSearchRequest):
+    """Top-k indexed jobs for a CV by TF-IDF cosine similarity. Local only, no LLM call."""
+    return [
+        {"job_id": job_id, "similarity": round(score, 4)}
+        for job_id, score in JOB_INDEX.search(request.cv_text, request.top_k)
+    ]
+
+
 @app.post("/generate-cv", response_model=CVData)
 async def generate_cv_endpoint(
     request: GenerateCVRequest,
     api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
 ):
     api_key, provider = api_auth
     try:
@@ -155,6 +575,7 @@ async def generate_cv_endpoint(
             language=request.language,
             provider=provider,
             template_id=request.template_id,
+            use_cache=use_cache,
         )
         return result
     except RuntimeError as e:
@@ -163,40 +584,331 @@ async def generate_cv_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/generate-cv/stream")
+async def generate_cv_stream_endpoint(
+    request: GenerateCVRequest,
+    api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
+):
+    """
+    Same as /generate-cv, streamed as Server-Sent Events. Each CVData section is
+    sent as soon as the model finishes it (contact, summary, then one event per
+    skills/experience/education entry); `done` carries the complete CVData.
+    """
+    api_key, provider = api_auth
+    try:
+        events = stream_generate_cv(
+            cv_text=request.cv_text,
+            job_description=request.job_description,
+            user_answers=[{"question": a.question, "answer": a.answer} for a in request.user_answers],
+            api_key=api_key,
+            language=request.language,
+            provider=provider,
+            template_id=request.template_id,
+            use_cache=use_cache,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return sse_response(events)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics: agent run latency, tokens, retries and estimated cost; render and extraction times."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/cache/stats")
+async def cache_stats_endpoint():
+    """
+    Hit/miss counters and sizes of the LLM response, extracted PDF text and export caches,
+    plus the provider-side prompt cache: input tokens vs. cached input tokens per agent.
+    """
+    return {
+        "llm_responses": RESPONSE_CACHE.stats(),
+        "prompt_cache": PROMPT_CACHE_STATS.snapshot(),
+        "pdf_text": PDF_TEXT_CACHE.stats(),
+        "exports": ARTIFACT_CACHE.stats(),
+    }
+
+
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+async def render_artifact(request: ExportRequest, fmt: str, key: str) -> bytes:
+    """Return the rendered file for `key`, rendering it on the format's pool on a cache miss."""
+    data = await ARTIFACT_CACHE.aget(key)
+    if data is None:
+        exporter = export_pdf if fmt == "pdf" else export_docx
+        with observe(RENDER_SECONDS, format=fmt):
+            data = await run_in_pool(fmt, exporter, request.cv_data, request.template_id, request.language)
+        await ARTIFACT_CACHE.aset(key, data)
+    return data
+
+
 @app.post("/export-pdf")
-async def export_pdf_endpoint(request: ExportRequest):
+async def export_pdf_endpoint(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
     """
     Convert CVData → HTML → WeasyPrint → ATS-friendly vector PDF.
     Returns a binary PDF file for download.
+    Rendered files are cached by content; `If-None-Match` with the returned ETag yields 304.
     """
+    key = artifact_key(request.cv_data, request.template_id, request.language, "pdf")
+    etag = make_etag(key)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     try:
-        pdf_bytes = export_pdf(request.cv_data, request.template_id, request.language)
+        pdf_bytes = await render_artifact(request, "pdf", key)
         return StreamingResponse(
             BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={"Content-Disposition": 'attachment; filename="optimized_cv.pdf"'},
+            media_type=EXPORT_MEDIA_TYPES["pdf"],
+            headers={"Content-Disposition": 'attachment; filename="optimized_cv.pdf"', "ETag": etag},
         )
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
 
 
 @app.post("/export-docx")
-async def export_docx_endpoint(request: ExportRequest):
+async def export_docx_endpoint(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
     """
     Convert CVData → python-docx → ATS-friendly .docx file.
     Returns a Word document for download.
+    Rendered files are cached by content; `If-None-Match` with the returned ETag yields 304.
     """
+    key = artifact_key(request.cv_data, request.template_id, request.language, "docx")
+    etag = make_etag(key)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     try:
-        docx_bytes = export_docx(request.cv_data, request.template_id, request.language)
+        docx_bytes = await render_artifact(request, "docx", key)
         return StreamingResponse(
             BytesIO(docx_bytes),
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": 'attachment; filename="optimized_cv.docx"'},
+            media_type=EXPORT_MEDIA_TYPES["docx"],
+            headers={"Content-Disposition": 'attachment; filename="optimized_cv.docx"', "ETag": etag},
         )
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DOCX generation failed: {str(e)}")
 
 
+# ============================================================
+# ==================== BATCH EXPORT ==========================
+# ============================================================
+
+EXPORT_BATCH_MAX_ITEMS = int(os.getenv("EXPORT_BATCH_MAX_ITEMS", "500"))
+EXPORT_BATCH_CONCURRENCY = int(os.getenv("EXPORT_BATCH_CONCURRENCY", "4"))
+EXPORT_BATCH_RETRY_SECONDS = 0.2
+
+
+class ZipSink:
+    """Write-only file object for `zipfile`: collects what was written until the next `drain()`."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def batch_filename(index: int, item: ExportBatchItem) -> str:
+    """Unique, filesystem-safe archive name: position prefix, then the given name or the candidate's."""
+    stem = re.sub(r"[^\w.-]+", "_", item.filename or item.cv_data.contact.name).strip("._") or "cv"
+    return f"{index + 1:03d}_{stem[:80]}.{item.format}"
+
+
+async def render_when_free(request: ExportRequest, fmt: str) -> bytes:
+    """`render_artifact` that waits for pool capacity instead of failing, for batches and background jobs."""
+    key = artifact_key(request.cv_data, request.template_id, request.language, fmt)
+    while True:
+        try:
+            return await render_artifact(request, fmt, key)
+        except PoolSaturatedError:
+            await asyncio.sleep(EXPORT_BATCH_RETRY_SECONDS)
+
+
+async def render_batch(
+    items: List[ExportBatchItem], concurrency: int
+) -> AsyncIterator[Tuple[int, Optional[bytes], Optional[Exception]]]:
+    """
+    Render items in completion order, `concurrency` at a time. A new render only starts
+    once a finished one has been consumed, so at most `concurrency` files are held in memory.
+    """
+    async def render(index: int, item: ExportBatchItem):
+        try:
+            return index, await render_when_free(item, item.format), None
+        except Exception as e:
+            return index, None, e
+
+    queue = iter(enumerate(items))
+    pending = {asyncio.ensure_future(render(i, item)) for i, item in islice(queue, concurrency)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+                pending.update(asyncio.ensure_future(render(i, item)) for i, item in islice(queue, 1))
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@app.post("/export/batch")
+async def export_batch_endpoint(request: ExportBatchRequest):
+    """
+    Render many CVs (PDF and/or DOCX) on the worker pools and stream them back as one ZIP.
+    Entries are written as soon as each render finishes; failed items are listed in
+    `errors.json` at the end of the archive instead of aborting the download.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="items must not be empty")
+    if len(request.items) > EXPORT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {EXPORT_BATCH_MAX_ITEMS} items per batch")
+
+    async def zip_chunks():
+        sink = ZipSink()
+        errors = []
+        # Rendered PDFs and DOCX files are already compressed: store them as is.
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            async for index, data, error in render_batch(request.items, EXPORT_BATCH_CONCURRENCY):
+                name = batch_filename(index, request.items[index])
+                if error is not None:
+                    errors.append({"index": index, "filename": name, "error": str(error)})
+                    continue
+                archive.writestr(zipfile.ZipInfo(name, date_time=time.localtime()[:6]), data)
+                yield sink.drain()
+            if errors:
+                archive.writestr("errors.json", json.dumps(errors, ensure_ascii=False, indent=2))
+        yield sink.drain()
+
+    return StreamingResponse(
+        zip_chunks(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="cv_export.zip"'},
+    )
+
+
+# ============================================================
+# ======================== JOBS ==============================
+# ============================================================
+
+async def generate_cv_job(payload: dict, api_key: Optional[str]) -> Tuple[bytes, str]:
+    request = GenerateCVRequest.model_validate(payload["request"])
+    result = await generate_cv(
+        cv_text=request.cv_text,
+        job_description=request.job_description,
+        user_answers=[{"question": a.question, "answer": a.answer} for a in request.user_answers],
+        api_key=api_key,
+        language=request.language,
+        provider=payload["provider"],
+        template_id=request.template_id,
+        use_cache=payload["use_cache"],
+    )
+    return result.model_dump_json().encode("utf-8"), "application/json"
+
+
+def export_job(fmt: str):
+    async def run(payload: dict, api_key: Optional[str]) -> Tuple[bytes, str]:
+        request = ExportRequest.model_validate(payload["request"])
+        return await render_when_free(request, fmt), EXPORT_MEDIA_TYPES[fmt]
+    return run
+
+
+JOB_QUEUE.register("generate-cv", generate_cv_job)
+JOB_QUEUE.register("export-pdf", export_job("pdf"))
+JOB_QUEUE.register("export-docx", export_job("docx"))
+
+
+async def submit_job(job_type: str, payload: dict, api_key: Optional[str], webhook_url: Optional[str]) -> JSONResponse:
+    if webhook_url:
+        try:
+            await resolve_webhook(webhook_url)
+        except WebhookURLError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    job = JOB_QUEUE.submit(job_type, payload, api_key, webhook_url)
+    return JSONResponse(job_status(job), status_code=202, headers={"Location": f"/jobs/{job.id}"})
+
+
+@app.post("/jobs/generate-cv", status_code=202)
+async def generate_cv_job_endpoint(
+    request: GenerateCVJobRequest,
+    api_auth: Tuple = Depends(get_api_key),
+    use_cache: bool = Depends(use_response_cache),
+):
+    """
+    Queue a /generate-cv run and return its job id right away. Poll `GET /jobs/{id}`
+    or pass `webhook_url` to be called when it finishes. The API key is kept in
+    memory only, never written to the job store.
+    """
+    api_key, provider = api_auth
+    try:
+        get_client(api_key, provider)  # fail fast (401) instead of queueing a job that cannot run
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    payload = {
+        "request": request.model_dump(mode="json", exclude={"webhook_url"}),
+        "provider": provider,
+        "use_cache": use_cache,
+    }
+    return await submit_job("generate-cv", payload, api_key, request.webhook_url)
+
+
+@app.post("/jobs/export-pdf", status_code=202)
+async def export_pdf_job_endpoint(request: ExportJobRequest):
+    """Queue a PDF render; the file is served by `GET /jobs/{id}/result` once the job succeeds."""
+    payload = {"request": request.model_dump(mode="json", exclude={"webhook_url"})}
+    return await submit_job("export-pdf", payload, None, request.webhook_url)
+
+
+@app.post("/jobs/export-docx", status_code=202)
+async def export_docx_job_endpoint(request: ExportJobRequest):
+    """Queue a DOCX render; the file is served by `GET /jobs/{id}/result` once the job succeeds."""
+    payload = {"request": request.model_dump(mode="json", exclude={"webhook_url"})}
+    return await submit_job("export-docx", payload, None, request.webhook_url)
+
+
+@app.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str):
+    job = JOB_QUEUE.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job_status(job)
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result_endpoint(job_id: str):
+    """The job's output: CVData JSON for generate-cv, the file for exports. 409 until the job has succeeded."""
+    job = JOB_QUEUE.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    result = JOB_QUEUE.store.result(job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is {job.status}")
+    data, media_type = result
+    headers = {}
+    if job.type.startswith("export-"):
+        extension = job.type.removeprefix("export-")
+        headers["Content-Disposition"] = f'attachment; filename="optimized_cv.{extension}"'
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
 # ============================================================
 # ====================== RUN SERVER ==========================
 # ============================================================
@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+
+# ============================================================
+# PRICING
+# ============================================================
+# USD per 1M tokens: (input, cached input, output). Models not listed cost 0,
+# e.g. local Ollama models. Update when provider prices change.
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+}
+
+
+def estimate_cost(model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+    input_price, cached_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0, 0.0))
+    return (
+        (input_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+# ============================================================
+# METRICS
+# ============================================================
+LLM_LABELS = ("provider", "model", "endpoint", "language")
+
+# LLM calls take seconds to tens of seconds, renders and extraction milliseconds to seconds.
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+WORK_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LLM_RUN_SECONDS = Histogram(
+    "smartcv_llm_run_duration_seconds", "Duration of one agent run", LLM_LABELS + ("agent", "status"),
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "smartcv_llm_tokens", "Tokens used by agent runs; kind is prompt, cached or completion", LLM_LABELS + ("kind",),
+)
+LLM_COST = Counter("smartcv_llm_cost_usd", "Estimated cost of agent runs in USD", LLM_LABELS)
+LLM_RETRIES = Counter("smartcv_llm_retries", "Agent runs repeated after a failed validation", LLM_LABELS)
+
+RENDER_SECONDS = Histogram(
+    "smartcv_render_duration_seconds", "Duration of PDF/DOCX renders (cache misses only)", ("format",),
+    buckets=WORK_BUCKETS,
+)
+EXTRACT_SECONDS = Histogram(
+    "smartcv_extract_duration_seconds", "Duration of PDF text extraction (cache misses only)", ("endpoint",),
+    buckets=WORK_BUCKETS,
+)
+EXTRACT_PAGES = Counter("smartcv_extract_pages", "PDF pages extracted", ("endpoint",))
+INTEGRITY_CHECKS = Counter(
+    "smartcv_integrity_checks", "Local integrity check outcomes; only ambiguous ones call the LLM", ("outcome",),
+)
+
+
+def record_llm_run(
+    provider: str,
+    model: str,
+    endpoint: str,
+    language: str,
+    agent: str,
+    seconds: float,
+    usage=None,
+    failed: bool = False,
+) -> None:
+    """Record one agent run. `usage` is the agents SDK Usage of the run, if it completed."""
+    labels = dict(provider=provider, model=model, endpoint=endpoint, language=language)
+    LLM_RUN_SECONDS.labels(agent=agent, status="error" if failed else "ok", **labels).observe(seconds)
+    if usage is None:
+        return
+    cached = usage.input_tokens_details.cached_tokens or 0
+    LLM_TOKENS.labels(kind="prompt", **labels).inc(usage.input_tokens)
+    LLM_TOKENS.labels(kind="cached", **labels).inc(cached)
+    LLM_TOKENS.labels(kind="completion", **labels).inc(usage.output_tokens)
+    LLM_COST.labels(**labels).inc(estimate_cost(model, usage.input_tokens, cached, usage.output_tokens))
+
+
+def record_llm_retry(provider: str, model: str, endpoint: str, language: str) -> None:
+    LLM_RETRIES.labels(provider=provider, model=model, endpoint=endpoint, language=language).inc()
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Time the block into `histogram`. Blocks that raise (e.g. a saturated pool) are not recorded."""
+    started = time.perf_counter()
+    yield
+    histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Prometheus text exposition of every metric, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,39 +1,216 @@
-import fitz  # PyMuPDF
-import re
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
 import markdown
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
 from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration
+
+from cache import make_cache
+from exporters.assets import font_face_css, get_font_config, get_url_fetcher
+from pdf_text import extract_page_range, pdf_page_count
+from workers import PoolSaturatedError, get_pool
 
 
 # ============================================================
 # PDF TEXT EXTRACTION
 # ============================================================
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+# Upload limits, enforced while the upload is read and before any page is parsed.
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "200"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Multipart framing (boundaries, part headers, other fields) allowed on top of
+# PDF_MAX_BYTES when a request is rejected from its Content-Length alone.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Documents shorter than this are extracted by a single worker.
+MIN_PAGES_PER_WORKER = 8
+
+class PDFLimitError(ValueError):
+    """Raised when an upload exceeds PDF_MAX_BYTES or PDF_MAX_PAGES."""
+
+
+class PDFUploadError(ValueError):
+    """Raised when a request does not carry a usable .pdf upload."""
+
+
+class _FilePartParser:
+    """
+    Incremental multipart/form-data parser that keeps only the first part named
+    `field`: its filename once the part headers are in, and its bytes in `data`
+    until the caller takes them. Every other part is discarded.
+    """
+
+    def __init__(self, boundary: bytes, field: str):
+        self.field = field.encode("latin-1")
+        self.filename: Optional[str] = None
+        self.data = bytearray()
+        self.size = 0
+        self._in_field = False
+        self._header_name = bytearray()
+        self._header_value = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": lambda data, start, end: self._header_name.extend(data[start:end]),
+            "on_header_value": lambda data, start, end: self._header_value.extend(data[start:end]),
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def write(self, chunk: bytes) -> None:
+        self._parser.write(chunk)
+
+    def finalize(self) -> None:
+        self._parser.finalize()
+
+    def take(self) -> bytes:
+        data = bytes(self.data)
+        self.data.clear()
+        return data
+
+    def _on_part_begin(self) -> None:
+        self._headers.clear()
+
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_name).lower()] = bytes(self._header_value)
+        self._header_name.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_field = options.get(b"name") == self.field and self.filename is None
+        if self._in_field:
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self.data.extend(data[start:end])
+            self.size += end - start
+
+    def _on_part_end(self) -> None:
+        self._in_field = False
+
+
+async def spool_upload(request, max_bytes: int = PDF_MAX_BYTES) -> Optional[Tuple[str, str]]:
     """
-    Extracts text from a PDF file (bytes), removes excessive whitespace,
-    and returns the cleaned text.
+    Stream the `file` part of a multipart/form-data request from the socket into a
+    temporary file, hashing as it goes. The body is not spooled by the framework first,
+    so PDF_MAX_BYTES is enforced on Content-Length before anything is read and again as
+    the bytes arrive, and file writes run on a worker thread off the event loop.
+    Returns `(path, sha256_hex)`, or None when the request carries no file; the caller
+    must delete the file.
     """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        return None
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise PDFLimitError(f"PDF exceeds the maximum upload size of {max_bytes} bytes")
+
+    parser = _FilePartParser(options[b"boundary"], "file")
+    digest = hashlib.sha256()
+    tmp = None
+
+    async def flush() -> None:
+        data = parser.take()
+        digest.update(data)
+        await run_in_threadpool(tmp.write, data)
+
     try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if parser.filename is not None and tmp is None:
+                if not parser.filename.lower().endswith(".pdf"):
+                    raise PDFUploadError("Only .pdf files are supported")
+                tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+            if parser.size > max_bytes:
+                raise PDFLimitError(f"PDF exceeds the maximum upload size of {max_bytes} bytes")
+            if len(parser.data) >= UPLOAD_CHUNK_SIZE:
+                await flush()
+        parser.finalize()
+        if tmp is None:
+            return None
+        await flush()
+        await run_in_threadpool(tmp.close)
+    except BaseException as e:
+        if tmp is not None:
+            tmp.close()
+            os.unlink(tmp.name)
+        if isinstance(e, MultipartParseError):
+            raise PDFUploadError(f"Malformed multipart upload: {e}") from e
+        raise
+    return tmp.name, digest.hexdigest()
 
-        # Clean text: remove excessive whitespace
-        cleaned_text = re.sub(r'\s+', ' ', text).strip()
-        return cleaned_text
-    except Exception as e:
-        raise ValueError(f"Error processing PDF: {str(e)}")
+
+async def start_page_extraction(path: str, max_pages: int = PDF_MAX_PAGES) -> List[Tuple[int, "asyncio.Future"]]:
+    """
+    Split the document into contiguous page ranges and submit each to the extract pool.
+    Returns `(first_page, future)` pairs in page order. Raises PDFLimitError or
+    PoolSaturatedError before any page work is scheduled, so callers can still answer 413/503.
+    """
+    pool = get_pool("extract")
+    page_count = await pool.run(pdf_page_count, path)
+    if page_count > max_pages:
+        raise PDFLimitError(f"PDF has {page_count} pages; the maximum is {max_pages}")
+    if page_count == 0:
+        return []
+
+    parts = min(pool.max_workers, -(-page_count // MIN_PAGES_PER_WORKER), pool.available)
+    if parts == 0:
+        raise PoolSaturatedError(pool.name)
+    size = -(-page_count // parts)
+    return [
+        (start, pool.submit(extract_page_range, path, start, min(start + size, page_count)))
+        for start in range(0, page_count, size)
+    ]
+
+
+async def iter_extracted_pages(jobs: List[Tuple[int, "asyncio.Future"]]) -> AsyncIterator[Tuple[int, str, str]]:
+    """Yield `(page_number, raw_text, cleaned_text)` in page order as each range completes."""
+    try:
+        for start, future in jobs:
+            for offset, (raw_text, cleaned) in enumerate(await future):
+                yield start + offset + 1, raw_text, cleaned
+    finally:
+        for _, future in jobs:
+            future.cancel()
 
 
 # ============================================================
-# PDF GENERATION FROM MARKDOWN (ATS-friendly, vector text)
+# EXTRACTED TEXT CACHE
 # ============================================================
+# Users re-upload the same CV many times; the text is keyed by a digest of
+# the PDF bytes, which doubles as the ETag returned by /extract-text.
+PDF_TEXT_CACHE = make_cache("PDF_TEXT_CACHE", max_entries=512, max_bytes=32 * 1024 * 1024)
 
-_CV_CSS = """
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
 
+async def get_cached_pdf_text(digest: str) -> Optional[dict]:
+    """Return `{"raw": ..., "text": ...}` for a previously extracted PDF, if still cached."""
+    raw = await PDF_TEXT_CACHE.aget(digest)
+    return json.loads(raw) if raw is not None else None
+
+
+async def cache_pdf_text(digest: str, raw_text: str, cleaned_text: str) -> None:
+    """Store the text for the PDF whose bytes hash to `digest`."""
+    await PDF_TEXT_CACHE.aset(digest, json.dumps({"raw": raw_text, "text": cleaned_text}).encode("utf-8"))
+
+
+# ============================================================
+# PDF GENERATION FROM MARKDOWN (ATS-friendly, vector text)
+# ============================================================
+
+_CV_CSS = font_face_css() + """
 /* ── Page Setup ──────────────────────────────────────────── */
 @page {
     size: A4;
@@ -170,6 +347,12 @@ p, li {
 """
 
 
+@lru_cache(maxsize=None)
+def _cv_stylesheet() -> CSS:
+    """Parsed once per process and reused across renders."""
+    return CSS(string=_CV_CSS, font_config=get_font_config(), url_fetcher=get_url_fetcher())
+
+
 def markdown_to_pdf(markdown_text: str) -> bytes:
     """
     Convert a Markdown string to an ATS-friendly PDF (vector text, not rasterised image).
@@ -185,14 +368,13 @@ def markdown_to_pdf(markdown_text: str) -> bytes:
         extensions=["extra", "sane_lists"],
     )
 
-    # Step 2: Wrap in full HTML document with embedded CSS
+    # Step 2: Wrap in full HTML document (CSS is applied as a pre-parsed stylesheet)
     full_html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
     <title>Optimized CV</title>
-    <style>{_CV_CSS}</style>
 </head>
 <body>
 {html_body}
@@ -200,9 +382,9 @@ def markdown_to_pdf(markdown_text: str) -> bytes:
 </html>"""
 
     # Step 3: HTML → PDF bytes via WeasyPrint
-    font_config = FontConfiguration()
-    pdf_bytes = HTML(string=full_html).write_pdf(
-        font_config=font_config,
+    pdf_bytes = HTML(string=full_html, url_fetcher=get_url_fetcher()).write_pdf(
+        stylesheets=[_cv_stylesheet()],
+        font_config=get_font_config(),
         presentational_hints=True,
     )
 
@@ -0,0 +1,62 @@
+import re
+from typing import List, Tuple
+
+import pymupdf
+
+
+# ============================================================
+# PDF TEXT EXTRACTION
+# ============================================================
+# The "extract" pool's worker processes import only this module, so it must
+# stay free of the web, cache and WeasyPrint imports that pdf_processor needs.
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_text(text: str) -> str:
+    """Collapse excessive whitespace."""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def extract_pdf_text(file_bytes: bytes) -> Tuple[str, str]:
+    """
+    Extracts text from a PDF file (bytes) and returns `(raw_text, cleaned_text)`,
+    where the cleaned text has excessive whitespace removed.
+    """
+    try:
+        doc = pymupdf.open(stream=file_bytes, filetype="pdf")
+        raw_text = "".join(page.get_text() for page in doc)
+        return raw_text, clean_text(raw_text)
+    except Exception as e:
+        raise ValueError(f"Error processing PDF: {str(e)}")
+
+
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    """
+    Extracts text from a PDF file (bytes), removes excessive whitespace,
+    and returns the cleaned text.
+    """
+    return extract_pdf_text(file_bytes)[1]
+
+
+# ── Page ranges (run on the "extract" worker pool) ────────────────────────────
+
+def pdf_page_count(path: str) -> int:
+    try:
+        with pymupdf.open(path) as doc:
+            return doc.page_count
+    except Exception as e:
+        raise ValueError(f"Error processing PDF: {str(e)}")
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[Tuple[str, str]]:
+    """Return `(raw_text, cleaned_text)` for pages `start..stop-1` of the PDF at `path`."""
+    try:
+        with pymupdf.open(path) as doc:
+            pages = []
+            for number in range(start, stop):
+                raw_text = doc[number].get_text()
+                pages.append((raw_text, clean_text(raw_text)))
+            return pages
+    except Exception as e:
+        raise ValueError(f"Error processing PDF: {str(e)}")
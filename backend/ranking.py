@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Hashed feature space size. Each indexed job costs 4 * HASH_DIM bytes of memory.
+HASH_DIM = int(os.getenv("JOB_INDEX_HASH_DIM", str(2 ** 13)))
+JOB_INDEX_PATH = os.getenv("JOB_INDEX_PATH", ".cache/job_index.npz")
+
+# Keeps tech tokens such as "c++", "c#", "node.js" and "ci/cd" in one piece.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we will with you your "
+    "de da do das dos e em para com um uma o os as que y el la los las en por".split()
+)
+
+
+# ============================================================
+# FEATURES
+# ============================================================
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _bucket(feature: str, dim: int) -> int:
+    # crc32 instead of hash(): Python's str hash is salted per process, which
+    # would make a persisted index unreadable after a restart.
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+
+def term_frequencies(text: str, dim: int = HASH_DIM) -> np.ndarray:
+    """Sublinear (1 + log count) term frequencies of word unigrams and bigrams, hashed into `dim` buckets."""
+    tokens = _tokens(text)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = np.bincount(
+        np.fromiter((_bucket(f, dim) for f in features), dtype=np.int64, count=len(features)),
+        minlength=dim,
+    ).astype(np.float32)
+    nonzero = counts > 0
+    counts[nonzero] = 1.0 + np.log(counts[nonzero])
+    return counts
+
+
+# ============================================================
+# INDEX
+# ============================================================
+class JobIndex:
+    """
+    TF-IDF index of job descriptions over hashed n-gram features. Search is one
+    matrix-vector product (cosine similarity) plus a partial sort, so ranking a
+    CV against thousands of jobs takes milliseconds on CPU.
+    """
+
+    def __init__(self, path: Optional[str] = None, dim: int = HASH_DIM):
+        self.path = path
+        self.dim = dim
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._tf = np.zeros((0, dim), dtype=np.float32)
+        # IDF-weighted, L2-normalized matrix; rebuilt lazily after every change.
+        self._matrix: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._positions
+
+    def text(self, job_id: str) -> str:
+        return self._texts[self._positions[job_id]]
+
+    def add_many(self, jobs: Iterable[Tuple[str, str]]) -> int:
+        """Insert or replace `(job_id, text)` pairs. Returns how many were written."""
+        new_rows = []
+        written = 0
+        for job_id, text in jobs:
+            row = term_frequencies(text, self.dim)
+            position = self._positions.get(job_id)
+            if position is None:
+                self._positions[job_id] = len(self._ids) + len(new_rows)
+                self._ids.append(job_id)
+                self._texts.append(text)
+                new_rows.append(row)
+            else:
+                self._texts[position] = text
+                if position < len(self._tf):
+                    self._tf[position] = row
+                else:
+                    new_rows[position - len(self._tf)] = row
+            written += 1
+        if new_rows:
+            self._tf = np.vstack([self._tf, np.stack(new_rows)])
+        self._matrix = None
+        return written
+
+    def add(self, job_id: str, text: str) -> None:
+        self.add_many([(job_id, text)])
+
+    def remove(self, job_id: str) -> bool:
+        position = self._positions.pop(job_id, None)
+        if position is None:
+            return False
+        del self._ids[position]
+        del self._texts[position]
+        self._tf = np.delete(self._tf, position, axis=0)
+        self._positions = {job_id: i for i, job_id in enumerate(self._ids)}
+        self._matrix = None
+        return True
+
+    def _weighted(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._matrix is None:
+            document_frequency = np.count_nonzero(self._tf, axis=0)
+            self._idf = (np.log((1 + len(self)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+            matrix = self._tf * self._idf
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._matrix = matrix / np.maximum(norms, 1e-12)
+        return self._matrix, self._idf
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-`k` `(job_id, cosine similarity)` pairs for `query`, best first."""
+        if not self._ids or k <= 0:
+            return []
+        matrix, idf = self._weighted()
+        vector = term_frequencies(query, self.dim) * idf
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return []
+        scores = matrix @ (vector / norm)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        meta = json.dumps({"dim": self.dim, "ids": self._ids, "texts": self._texts}, ensure_ascii=False).encode("utf-8")
+        # Rows are very sparse, so they are stored in CSR form (indptr, indices, data).
+        rows, indices = np.nonzero(self._tf)
+        indptr = np.searchsorted(rows, np.arange(len(self) + 1)).astype(np.int64)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            indptr=indptr,
+            indices=indices.astype(np.int32),
+            data=self._tf[rows, indices],
+            meta=np.frombuffer(meta, dtype=np.uint8),
+        )
+        # Atomic swap so a crash mid-write never leaves a truncated index behind.
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, dim: int = HASH_DIM) -> "JobIndex":
+        """Load the index at `path`, or return an empty one if the file does not exist."""
+        index = cls(path, dim)
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as stored:
+            meta = json.loads(stored["meta"].tobytes().decode("utf-8"))
+            if meta["dim"] != dim:
+                raise ValueError(
+                    f"Job index at {path} was built with {meta['dim']} hash buckets, "
+                    f"but JOB_INDEX_HASH_DIM is {dim}. Delete the file to rebuild it."
+                )
+            indptr = stored["indptr"]
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            index._tf = np.zeros((len(indptr) - 1, dim), dtype=np.float32)
+            index._tf[rows, stored["indices"]] = stored["data"]
+        index._ids = meta["ids"]
+        index._texts = meta["texts"]
+        index._positions = {job_id: i for i, job_id in enumerate(index._ids)}
+        return index
+
+
+def rank_texts(query: str, texts: List[str], k: int) -> List[Tuple[int, float]]:
+    """Rank an ad-hoc list of texts against `query`. Returns `(position, score)` pairs, best first."""
+    index = JobIndex()
+    index.add_many((str(i), text) for i, text in enumerate(texts))
+    return [(int(job_id), score) for job_id, score in index.search(query, k)]
+
+
+JOB_INDEX = JobIndex.load(JOB_INDEX_PATH)
@@ -0,0 +1,396 @@
+import os
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+# ============================================================
+# SKILL DICTIONARY
+# ============================================================
+# Canonical skill name -> lowercase aliases matched as whole words, grouped by
+# domain. The canonical name itself is always matched too.
+SKILL_GROUPS: Dict[str, Dict[str, List[str]]] = {
+    "languages": {
+        "Python": [],
+        "Java": [],
+        "JavaScript": ["js", "ecmascript"],
+        "TypeScript": [],
+        "Go": ["golang"],
+        "Rust": [],
+        "C": [],
+        "C++": ["cpp"],
+        "C#": ["csharp", "c sharp"],
+        "Kotlin": [],
+        "Swift": [],
+        "Ruby": [],
+        "PHP": [],
+        "Scala": [],
+        "Elixir": [],
+        "R": [],
+        "SQL": [],
+        "Bash": ["shell scripting"],
+    },
+    "backend": {
+        "FastAPI": [],
+        "Django": [],
+        "Flask": [],
+        "Spring": ["spring boot"],
+        "Node.js": ["nodejs"],
+        "Express": ["express.js", "expressjs"],
+        "NestJS": ["nest.js"],
+        "Ruby on Rails": ["rails"],
+        "Laravel": [],
+        ".NET": ["dotnet", "asp.net", ".net core"],
+        "GraphQL": [],
+        "REST": ["rest api", "rest apis", "restful"],
+        "gRPC": [],
+        "Microservices": ["microservice", "micro-services"],
+    },
+    "frontend": {
+        "React": ["react.js", "reactjs"],
+        "Next.js": ["nextjs"],
+        "Vue": ["vue.js", "vuejs"],
+        "Angular": [],
+        "Svelte": [],
+        "Redux": [],
+        "HTML": ["html5"],
+        "CSS": ["css3", "sass", "scss"],
+        "Tailwind CSS": ["tailwind"],
+        "React Native": [],
+        "Flutter": [],
+        "Android": [],
+        "iOS": [],
+    },
+    "data stores": {
+        "PostgreSQL": ["postgres"],
+        "MySQL": [],
+        "SQL Server": ["mssql"],
+        "Oracle": [],
+        "MongoDB": ["mongo"],
+        "Redis": [],
+        "Elasticsearch": ["elastic search", "opensearch"],
+        "Cassandra": [],
+        "DynamoDB": [],
+        "Kafka": ["apache kafka"],
+        "RabbitMQ": [],
+        "SQS": [],
+    },
+    "infrastructure": {
+        "AWS": ["amazon web services"],
+        "GCP": ["google cloud", "google cloud platform"],
+        "Azure": ["microsoft azure"],
+        "Docker": [],
+        "Kubernetes": ["k8s"],
+        "Helm": [],
+        "Terraform": [],
+        "Ansible": [],
+        "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+        "GitHub Actions": [],
+        "Jenkins": [],
+        "GitLab CI": [],
+        "Linux": [],
+        "Serverless": ["aws lambda"],
+        "Prometheus": [],
+        "Grafana": [],
+        "Datadog": [],
+        "OpenTelemetry": [],
+    },
+    "data": {
+        "Pandas": [],
+        "NumPy": [],
+        "Spark": ["pyspark", "apache spark"],
+        "Airflow": ["apache airflow"],
+        "dbt": [],
+        "Snowflake": [],
+        "BigQuery": [],
+        "Databricks": [],
+        "Machine Learning": ["ml"],
+        "Deep Learning": [],
+        "PyTorch": [],
+        "TensorFlow": [],
+        "scikit-learn": ["sklearn"],
+        "LLM": ["llms", "large language models"],
+        "NLP": ["natural language processing"],
+        "Power BI": [],
+        "Tableau": [],
+    },
+    "practices": {
+        "Git": [],
+        "TDD": ["test-driven development", "test driven development"],
+        "Unit Testing": ["unit tests", "pytest", "jest", "junit"],
+        "Agile": [],
+        "Scrum": [],
+        "Kanban": [],
+        "DevOps": [],
+        "SRE": ["site reliability"],
+        "System Design": ["distributed systems"],
+        "Event-Driven Architecture": ["event-driven", "event driven", "event sourcing"],
+        "Application Security": ["owasp", "appsec"],
+        "OAuth": ["oauth2", "openid connect", "oidc"],
+    },
+}
+
+SKILL_ALIASES: Dict[str, List[str]] = {skill: aliases for group in SKILL_GROUPS.values() for skill, aliases in group.items()}
+SKILL_GROUP: Dict[str, str] = {skill: name for name, group in SKILL_GROUPS.items() for skill in group}
+
+# Names that are also everyday words ("go", "rest", "swift") only match with this exact casing.
+CASE_SENSITIVE = {"C", "R", "Go", "REST", "Rust", "Swift", "Spring", "Express", "Oracle", "Helm", "Ruby", "Scala", "Angular"}
+
+# Names that stay ambiguous even with exact casing ("Series C", "R&D", "Go-to-market",
+# "Spring 2021", "Oracle customers"). They only count in a skills context: a list
+# separator on both sides ("C, Go / Rust"), or another skill or a programming word
+# on the same line within CONTEXT_WINDOW characters.
+CONTEXT_SKILLS = {"C", "R", "Go", "Rust", "Swift", "Spring", "Express", "Oracle"}
+PROGRAMMING_WORDS = {
+    "language", "languages", "programming", "code", "coding", "developer", "developers",
+    "framework", "frameworks", "library", "libraries", "database", "databases", "stack",
+    "backend", "back-end", "frontend", "front-end", "sdk", "api", "apis", "services",
+}
+CONTEXT_WINDOW = 60
+_LIST_SEPARATORS = set(",;/|()[]:•·.")
+_WORD_JOINERS = set("-&'’")
+_CONTEXT_WORD_RE = re.compile(r"[a-z][a-z-]*")
+
+# Contact fields the gap analyzer asks about, with the regex that detects each in a CV.
+CONTACT_PATTERNS = {
+    "email": re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"),
+    "phone": re.compile(r"\+?\d[\d\s().-]{7,}\d"),
+    "linkedin": re.compile(r"linkedin\.com/in/[\w-]+", re.IGNORECASE),
+    "portfolio": re.compile(
+        r"(?<![@\w.-])(?:https?://)?(?:www\.)?(?!linkedin\.com)[\w-]+(?:\.[\w-]+)*\.(?:dev|io|me|com|net|org|app|site|page|br)\b(?![@\w.-])",
+        re.IGNORECASE,
+    ),
+}
+
+# Budget for CV / job excerpts sent with the digest.
+EXCERPT_MAX_CHARS = int(os.getenv("GAP_DIGEST_EXCERPT_CHARS", "2400"))
+# The first characters of a CV (name, title, location, links) are always kept.
+HEADER_CHARS = 300
+
+
+# ============================================================
+# AHO-CORASICK MATCHER
+# ============================================================
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: one pass over the text finds every occurrence of every
+    pattern, regardless of how many patterns there are. Matches must start and
+    end on word boundaries, so "go" does not match inside "django".
+    """
+
+    def __init__(self, patterns: Dict[str, Tuple[str, bool]]):
+        # patterns: pattern -> (label reported on match, whether the casing must match exactly)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+
+        for pattern, (label, case_sensitive) in patterns.items():
+            state = 0
+            for c in pattern.lower():
+                next_state = self._goto[state].get(c)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][c] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(pattern), label, pattern if case_sensitive else None))
+
+        # Breadth-first construction of failure links.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(c, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        `(start, end, label)` for every whole-word match in `text`, matched
+        case-insensitively. Overlapping matches resolve to the leftmost-longest
+        one, so "C++" is reported once and not also as "C".
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters (e.g. "İ") lowercase to two; keep offsets aligned with `text`.
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+        matches = []
+        state = 0
+        for i, c in enumerate(lowered):
+            while state and c not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(c, 0)
+            for length, label, exact in self._out[state]:
+                start, end = i - length + 1, i + 1
+                if exact is not None and text[start:end] != exact:
+                    continue
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if end < len(lowered) and _is_word_char(lowered[end]) and _is_word_char(lowered[end - 1]):
+                    continue
+                matches.append((start, end, label))
+
+        selected, covered_until = [], 0
+        for start, end, label in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= covered_until:
+                selected.append((start, end, label))
+                covered_until = end
+        return selected
+
+
+class SkillMatcher(AhoCorasick):
+    """AhoCorasick over the skill dictionary that drops CONTEXT_SKILLS hits outside a skills context."""
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = super().find(text)
+        if not any(label in CONTEXT_SKILLS for _, _, label in matches):
+            return matches
+        anchors = [start for start, _, label in matches if label not in CONTEXT_SKILLS]
+        return [
+            (start, end, label) for start, end, label in matches
+            if label not in CONTEXT_SKILLS or _in_skill_context(text, start, end, anchors)
+        ]
+
+
+def _in_skill_context(text: str, start: int, end: int, anchors: List[int]) -> bool:
+    before, after = text[:start], text[end:]
+    # Part of a compound word: "R&D", "C-level", "Go-to-market", "Rust-Oleum".
+    if after[:1] in _WORD_JOINERS and _is_word_char(after[1:2] or " "):
+        return False
+    if before[-1:] in _WORD_JOINERS and _is_word_char(before[-2:-1] or " "):
+        return False
+    # A season, a funding round or a product edition: "Spring 2021", "Series C 2019".
+    if re.match(r"\s*\d", after):
+        return False
+
+    previous, following = before.rstrip(" \t")[-1:], after.lstrip(" \t")[:1]
+    if previous in _LIST_SEPARATORS | {"", "\n"} and following in _LIST_SEPARATORS | {"", "\n"}:
+        return True
+
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    window_start = max(line_start, start - CONTEXT_WINDOW)
+    window_end = min(line_end if line_end >= 0 else len(text), end + CONTEXT_WINDOW)
+    if any(window_start <= anchor < window_end for anchor in anchors):
+        return True
+    words = _CONTEXT_WORD_RE.findall(text[window_start:window_end].lower())
+    return any(word in PROGRAMMING_WORDS for word in words)
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher() -> SkillMatcher:
+    patterns = {skill: (skill, skill in CASE_SENSITIVE) for skill in SKILL_ALIASES}
+    for skill, aliases in SKILL_ALIASES.items():
+        patterns.update((alias, (skill, False)) for alias in aliases)
+    return SkillMatcher(patterns)
+
+
+# ============================================================
+# GAP DIGEST
+# ============================================================
+class GapDigest(BaseModel):
+    required_skills: List[str]
+    matched_skills: List[str]
+    missing_skills: List[str]
+    missing_contact_fields: List[str]
+    cv_excerpts: List[str]
+    job_excerpts: List[str]
+
+    def render(self) -> str:
+        """Compact text sent to the Gap Analyzer in place of the full CV and job description."""
+        def bullets(items: List[str]) -> str:
+            return "\n".join(f"- {item}" for item in items) or "- (none)"
+
+        return (
+            f"Job skills missing from the CV:\n{bullets(self.missing_skills)}\n\n"
+            f"Job skills present in the CV:\n{bullets(self.matched_skills)}\n\n"
+            f"Contact fields missing from the CV:\n{bullets(self.missing_contact_fields)}\n\n"
+            f"Relevant CV excerpts:\n{bullets(self.cv_excerpts)}\n\n"
+            f"Relevant job description excerpts:\n{bullets(self.job_excerpts)}"
+        )
+
+
+_SEGMENT_RE = re.compile(r"[^\n.!?;]+[.!?;]?")
+
+
+def _segments(text: str) -> List[Tuple[int, str]]:
+    """Split text into sentence/line segments, with their start offsets."""
+    segments = [(m.start(), m.group().strip().lstrip("-•*·–").strip()) for m in _SEGMENT_RE.finditer(text)]
+    return [(start, segment) for start, segment in segments if segment]
+
+
+def _skills_by_segment(text: str) -> Tuple[Dict[str, List[int]], List[Tuple[int, str]]]:
+    """Map each skill found in `text` to the indices of the segments that mention it."""
+    segments = _segments(text)
+    starts = [start for start, _ in segments]
+    found: Dict[str, List[int]] = {}
+    for start, _, skill in get_skill_matcher().find(text):
+        segment = bisect_right(starts, start) - 1
+        positions = found.setdefault(skill, [])
+        if segment >= 0 and segment not in positions:
+            positions.append(segment)
+    return found, segments
+
+
+def _pick_excerpts(segments: List[Tuple[int, str]], wanted: List[int], budget: int, skip_before: int = 0) -> List[str]:
+    excerpts, used = [], 0
+    for index in sorted(set(wanted)):
+        start, segment = segments[index]
+        if start < skip_before:
+            continue
+        if used + len(segment) > budget:
+            break
+        excerpts.append(segment)
+        used += len(segment)
+    return excerpts
+
+
+def build_gap_digest(cv_text: str, job_description: str, max_excerpt_chars: int = EXCERPT_MAX_CHARS) -> GapDigest:
+    """
+    Deterministic pre-pass for gap analysis: which job skills the CV covers or misses,
+    which contact fields are absent, and the few CV/job sentences that mention them.
+    """
+    job_skills, job_segments = _skills_by_segment(job_description)
+    cv_skills, cv_segments = _skills_by_segment(cv_text)
+
+    required = list(job_skills)
+    matched = [skill for skill in required if skill in cv_skills]
+    missing = [skill for skill in required if skill not in cv_skills]
+
+    header = cv_text[:HEADER_CHARS].rsplit("\n", 1)[0] if len(cv_text) > HEADER_CHARS else cv_text
+    missing_contact = [field for field, pattern in CONTACT_PATTERNS.items() if not pattern.search(cv_text)]
+
+    # CV sentences that show how matched skills were used give the model project context;
+    # job sentences that mention missing skills tell it what to ask about.
+    budget = max_excerpt_chars // 2
+    cv_excerpts = [header.strip()] + _pick_excerpts(
+        cv_segments, [i for skill in matched for i in cv_skills[skill][:2]], budget - len(header), len(header)
+    )
+    # The first job segment is usually the role title and seniority.
+    job_title = job_segments[:1]
+    job_excerpts = [segment for _, segment in job_title] + _pick_excerpts(
+        job_segments, [i for skill in required for i in job_skills[skill][:1]], budget, job_title[0][0] + 1 if job_title else 0
+    )
+
+    return GapDigest(
+        required_skills=required,
+        matched_skills=matched,
+        missing_skills=missing,
+        missing_contact_fields=missing_contact,
+        cv_excerpts=cv_excerpts,
+        job_excerpts=job_excerpts,
+    )
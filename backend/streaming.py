@@ -0,0 +1,132 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (field, index, value): `index` is set for elements of an expanded array field.
+FieldEvent = Tuple[str, Optional[int], Any]
+
+
+class JSONFieldStream:
+    """
+    Incremental scanner for one streamed JSON object.
+
+    `feed()` takes text deltas as they arrive from the model and returns every
+    top-level field whose value has just become complete. Fields listed in
+    `expand` must hold arrays; their elements are reported one by one as soon
+    as each element is complete, instead of waiting for the whole array.
+    `completed` maps every top-level field fully received so far to its value,
+    including expanded arrays once their closing bracket arrives.
+    """
+
+    def __init__(self, expand: Iterable[str] = ()):
+        self.expand = set(expand)
+        self.completed: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._awaiting_value = False
+        self._value_start: Optional[int] = None
+        self._expanding = False
+        self._element_start: Optional[int] = None
+        self._element_index = 0
+
+    def feed(self, chunk: str) -> List[FieldEvent]:
+        self._text += chunk
+        events: List[FieldEvent] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                continue
+
+            if c in " \t\r\n":
+                continue
+
+            if self._depth == 1 and self._awaiting_value:
+                self._awaiting_value = False
+                self._value_start = i
+                if c == "[" and self._key in self.expand:
+                    self._expanding = True
+                    self._element_index = 0
+            elif self._depth == 2 and self._expanding and self._element_start is None and c not in ",]":
+                self._element_start = i
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif c == ":" and self._depth == 1:
+                self._awaiting_value = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                self._close_container(i, c, events)
+            elif c == ",":
+                self._close_scalar(i, events)
+
+        self._pos = len(text)
+        return events
+
+    # ── Completion handlers ──────────────────────────────────────────────────
+
+    def _close_string(self, i: int, events: List[FieldEvent]) -> None:
+        if self._depth == 1:
+            if self._key_start is not None:
+                self._key = json.loads(self._text[self._key_start:i + 1])
+                self._key_start = None
+            elif self._value_start is not None:
+                self._emit_field(i + 1, events)
+        elif self._depth == 2 and self._expanding and self._element_start is not None:
+            self._emit_element(i + 1, events)
+
+    def _close_container(self, i: int, c: str, events: List[FieldEvent]) -> None:
+        if self._depth == 0:
+            # End of the whole object: flush a trailing scalar value.
+            if self._value_start is not None:
+                self._emit_field(i, events)
+        elif self._depth == 1 and self._value_start is not None:
+            if self._expanding:
+                if self._element_start is not None:
+                    self._emit_element(i, events)
+                self.completed[self._key] = json.loads(self._text[self._value_start:i + 1])
+                self._expanding = False
+                self._value_start = None
+            else:
+                self._emit_field(i + 1, events)
+        elif self._depth == 2 and self._expanding and self._element_start is not None:
+            self._emit_element(i + 1, events)
+
+    def _close_scalar(self, i: int, events: List[FieldEvent]) -> None:
+        if self._depth == 1 and self._value_start is not None:
+            self._emit_field(i, events)
+        elif self._depth == 2 and self._expanding and self._element_start is not None:
+            self._emit_element(i, events)
+
+    def _emit_field(self, end: int, events: List[FieldEvent]) -> None:
+        value = json.loads(self._text[self._value_start:end])
+        events.append((self._key, None, value))
+        self.completed[self._key] = value
+        self._value_start = None
+
+    def _emit_element(self, end: int, events: List[FieldEvent]) -> None:
+        events.append((self._key, self._element_index, json.loads(self._text[self._element_start:end])))
+        self._element_index += 1
+        self._element_start = None
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+from cache import MemoryCache, SQLiteCache, TieredCache
+
+
+def _tiered(tmp_path):
+    return TieredCache(MemoryCache(max_bytes=1024), SQLiteCache(str(tmp_path / "cache.sqlite3")))
+
+
+def test_async_methods_match_sync_ones(tmp_path):
+    cache = _tiered(tmp_path)
+
+    async def run():
+        assert await cache.aget("missing") is None
+        await cache.aset("key", b"value")
+        return await cache.aget("key")
+
+    assert asyncio.run(run()) == b"value"
+    assert cache.get("key") == b"value"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_tier_runs_off_the_event_loop(tmp_path):
+    cache = _tiered(tmp_path)
+    threads = []
+    read = cache.disk._get
+    cache.disk._get = lambda key: threads.append(threading.current_thread()) or read(key)
+
+    async def run():
+        await cache.aset("key", b"x" * 2048)  # too large for the memory tier
+        return await cache.aget("key"), threading.current_thread()
+
+    value, loop_thread = asyncio.run(run())
+    assert value == b"x" * 2048
+    assert threads and loop_thread not in threads
+
+
+def test_memory_hits_stay_inline(tmp_path):
+    cache = _tiered(tmp_path)
+    cache.disk._get = lambda key: (_ for _ in ()).throw(AssertionError("disk read"))
+
+    async def run():
+        await cache.aset("key", b"small")
+        return await cache.aget("key")
+
+    assert asyncio.run(run()) == b"small"
@@ -0,0 +1,89 @@
+from integrity import check_integrity
+
+SOURCE = (
+    "Original CV:\n"
+    "Jane Doe - Backend Developer at Acme Ltd (2019-2024)\n"
+    "Built REST services with Django and PostgreSQL, cutting response times by 40%.\n\n"
+    "Candidate Clarifications:\n"
+)
+
+
+def _cv(summary="", skills=(), bullets=(), company="Acme Ltd", title="Backend Developer"):
+    return {
+        "summary": summary,
+        "skills": [{"category": "Technical", "items": list(skills)}] if skills else [],
+        "experience": [{
+            "job_title": title,
+            "company": company,
+            "bullets": [{"text": text} for text in bullets],
+        }],
+    }
+
+
+def test_source_facts_pass():
+    result = check_integrity(SOURCE, _cv(
+        skills=["Django", "PostgreSQL"],
+        bullets=["Cut response times by 40% on Django services."],
+    ))
+    assert result.valid
+    assert result.invented_terms == []
+    assert result.ambiguous_terms == []
+
+
+def test_implied_skills_are_not_invented():
+    # Django is written in Python and PostgreSQL is queried with SQL.
+    result = check_integrity(SOURCE, _cv(skills=["Python", "SQL", "Django", "PostgreSQL"]))
+    assert result.valid
+    assert result.ambiguous_terms == []
+
+
+def test_inferred_skills_do_not_force_a_correction():
+    result = check_integrity(SOURCE, _cv(
+        summary="Python developer focused on SQL performance and CI/CD.",
+        skills=["Python", "SQL", "CI/CD"],
+        bullets=["Cut response times by 40% on Django services."],
+    ))
+    assert result.valid
+    assert result.invented_terms == []
+
+
+def test_practices_are_left_to_the_validator():
+    result = check_integrity(SOURCE, _cv(skills=["CI/CD", "Django"]))
+    assert result.valid
+    assert result.ambiguous_terms == ["CI/CD"]
+
+
+def test_related_skill_is_ambiguous():
+    # MySQL is another data store next to PostgreSQL: plausible, so the validator decides.
+    result = check_integrity(SOURCE, _cv(skills=["MySQL"]))
+    assert result.valid
+    assert result.ambiguous_terms == ["MySQL"]
+
+
+def test_skill_from_unrelated_domain_is_invented():
+    result = check_integrity(SOURCE, _cv(skills=["Kubernetes"], bullets=["Trained models with PyTorch."]))
+    assert not result.valid
+    assert result.invented_terms == ["PyTorch", "Kubernetes"]
+
+
+def test_alias_not_in_source_is_ambiguous():
+    result = check_integrity(SOURCE, _cv(skills=["Postgres"]))
+    assert result.valid
+    assert result.ambiguous_terms == ["Postgres"]
+
+
+def test_word_like_skill_is_ambiguous():
+    result = check_integrity(SOURCE, _cv(bullets=["Wrote services in Go, Django and PostgreSQL."]))
+    assert result.valid
+    assert result.ambiguous_terms == ["Go"]
+
+
+def test_new_percentage_is_invented():
+    result = check_integrity(SOURCE, _cv(bullets=["Cut response times by 65%."]))
+    assert not result.valid
+    assert result.invented_terms == ["65%"]
+
+
+def test_unknown_company_is_invented():
+    result = check_integrity(SOURCE, _cv(company="Globex Corp"))
+    assert result.invented_terms == ["Globex Corp"]
@@ -0,0 +1,47 @@
+from typing import List
+
+from schemas.cv import CVData
+
+
+# ============================================================
+# STRUCTURE VALIDATION
+# ============================================================
+# Local replacement for an LLM structure check: pydantic already guarantees the
+# fields exist and have the right types, these rules add what the schema cannot
+# express (non-empty content, at least one bullet per role, score range).
+def structure_violations(cv: CVData) -> List[str]:
+    """Return one message per broken rule; an empty list means the structure is valid."""
+    violations = []
+
+    if not cv.contact.name.strip():
+        violations.append("contact.name is empty")
+    if not cv.summary.strip():
+        violations.append("summary is empty")
+    if not cv.optimization_report.strip():
+        violations.append("optimization_report is empty")
+    if not 0 <= cv.match_score <= 100:
+        violations.append(f"match_score {cv.match_score} is outside 0-100")
+
+    if not cv.skills:
+        violations.append("skills is empty")
+    for i, group in enumerate(cv.skills):
+        if not any(item.strip() for item in group.items):
+            violations.append(f"skills[{i}] ({group.category}) has no items")
+
+    if not cv.experience:
+        violations.append("experience is empty")
+    for i, entry in enumerate(cv.experience):
+        for field in ("job_title", "company", "start_date", "end_date"):
+            if not getattr(entry, field).strip():
+                violations.append(f"experience[{i}].{field} is empty")
+        if not any(bullet.text.strip() for bullet in entry.bullets):
+            violations.append(f"experience[{i}] has no bullets")
+
+    if not cv.education:
+        violations.append("education is empty")
+    for i, entry in enumerate(cv.education):
+        for field in ("degree", "institution"):
+            if not getattr(entry, field).strip():
+                violations.append(f"education[{i}].{field} is empty")
+
+    return violations
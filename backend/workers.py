@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+# ============================================================
+# POOL CONFIG
+# ============================================================
+# Each CPU-heavy job type gets its own executor so a burst of one kind of
+# work (e.g. WeasyPrint renders) cannot starve the others or the event loop.
+# Every value can be overridden with POOL_<NAME>_KIND / _WORKERS / _QUEUE.
+POOL_CONFIG = {
+    "extract": {"kind": "process", "max_workers": 2, "max_queue": 16},
+    "pdf": {"kind": "process", "max_workers": 2, "max_queue": 8},
+    "docx": {"kind": "thread", "max_workers": 4, "max_queue": 16},
+}
+
+# Process pools start workers with "spawn" (or "forkserver") rather than the
+# platform default "fork": a forked child inherits the event loop, open sockets,
+# SQLite connections and the locks of every running thread. Spawned workers
+# import only the module of each function they run, so those modules keep
+# heavy dependencies out of module scope.
+PROCESS_START_METHOD = os.getenv("POOL_START_METHOD", "spawn")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool already has `max_workers + max_queue` jobs in flight."""
+
+    def __init__(self, pool_name: str):
+        super().__init__(f"The '{pool_name}' worker pool is saturated. Try again shortly.")
+        self.pool_name = pool_name
+
+
+class WorkerPool:
+    """A bounded process or thread pool that can be awaited from the event loop."""
+
+    def __init__(self, name: str, kind: str = "process", max_workers: int = 2, max_queue: int = 8):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Invalid pool kind '{kind}' for pool '{name}'. Use 'process' or 'thread'.")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker"
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def available(self) -> int:
+        return max(0, self.capacity - self._in_flight)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> "asyncio.Future[Any]":
+        """
+        Schedule `fn(*args, **kwargs)` on the pool and return an awaitable future.
+        Raises PoolSaturatedError immediately (before anything is scheduled) if the pool is full.
+        """
+        if self._in_flight >= self.capacity:
+            raise PoolSaturatedError(self.name)
+        self.start()
+
+        # The counter is only touched from the event loop thread, so no lock is needed.
+        # It is released when the executor job really finishes, even if the awaiting
+        # request was cancelled, so abandoned renders still count against the queue.
+        loop = asyncio.get_running_loop()
+        job = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        self._in_flight += 1
+        job.add_done_callback(functools.partial(self._release_from_executor, loop))
+        return asyncio.wrap_future(job, loop=loop)
+
+    def _release_from_executor(self, loop: asyncio.AbstractEventLoop, _job: Any) -> None:
+        # Runs on an executor thread. A job can outlive the loop that submitted it
+        # (shutdown, or a script's asyncio.run returning), and then there is nothing to release.
+        if loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # the loop closed after the check
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` on the pool, or raise PoolSaturatedError if it is full."""
+        return await self.submit(fn, *args, **kwargs)
+
+
+# ============================================================
+# POOL REGISTRY
+# ============================================================
+def _pool_from_env(name: str, defaults: dict) -> WorkerPool:
+    prefix = f"POOL_{name.upper()}"
+    return WorkerPool(
+        name=name,
+        kind=os.getenv(f"{prefix}_KIND", defaults["kind"]),
+        max_workers=int(os.getenv(f"{prefix}_WORKERS", defaults["max_workers"])),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE", defaults["max_queue"])),
+    )
+
+
+_POOLS: Dict[str, WorkerPool] = {}
+
+
+def get_pool(name: str) -> WorkerPool:
+    pool = _POOLS.get(name)
+    if pool is None:
+        if name not in POOL_CONFIG:
+            raise KeyError(f"Unknown worker pool '{name}'. Valid options: {list(POOL_CONFIG.keys())}")
+        pool = _POOLS[name] = _pool_from_env(name, POOL_CONFIG[name])
+    return pool
+
+
+async def run_in_pool(name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return await get_pool(name).run(fn, *args, **kwargs)
+
+
+def start_pools() -> None:
+    for name in POOL_CONFIG:
+        get_pool(name).start()
+
+
+def shutdown_pools() -> None:
+    for pool in _POOLS.values():
+        pool.shutdown()
+    _POOLS.clear()